@@ -5,10 +5,15 @@ Handles bill data extraction from document images
 
 import logging
 import json
+import math
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from typing import Dict, Any, Optional, Tuple
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 from config import Config
+from utils.json_provider import OrjsonProvider
 
 # ============================================================================
 # Configure Logging
@@ -28,9 +33,10 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 CORS(app)
 
-# Configure Flask app settings
-app.config['JSON_SORT_KEYS'] = Config.JSON_SORT_KEYS
-app.config['JSONIFY_PRETTYPRINT_REGULAR'] = Config.JSONIFY_PRETTYPRINT_REGULAR
+# Serialize with orjson; compact output unless pretty-printing is enabled
+app.json = OrjsonProvider(app)
+app.json.sort_keys = Config.JSON_SORT_KEYS
+app.json.compact = not Config.JSONIFY_PRETTYPRINT_REGULAR
 
 
 # ============================================================================
@@ -41,9 +47,9 @@ try:
     logger.info("🚀 Initializing Bill Extraction API...")
     Config.validate_config()
     logger.info("✅ Configuration validated successfully")
-    logger.info(f"📊 Configuration: {Config.get_config_summary()}")
+    logger.info("📊 Configuration: %s", Config.get_config_summary())
 except ValueError as e:
-    logger.error(f"❌ Configuration error: {e}")
+    logger.error("❌ Configuration error: %s", e)
     raise
 
 
@@ -55,6 +61,259 @@ from utils.ocr_extractor import OCRExtractor
 from utils.llm_processor import LLMProcessor
 from utils.response_formatter import ResponseFormatter
 from utils.validators import BillValidator
+from utils.response_cache import ResponseCache
+from utils.batcher import ExtractionBatcher
+from utils.rate_limit import TokenBucket
+from utils.single_flight import SingleFlight
+
+# Shared across requests; Tesseract setup runs once per worker
+ocr_extractor = OCRExtractor()
+
+# Shared across requests; repeated document URLs skip download, OCR and LLM
+response_cache = ResponseCache(
+    maxsize=Config.RESPONSE_CACHE_SIZE,
+    ttl=Config.RESPONSE_CACHE_TTL
+)
+
+# Concurrent requests for the same URL wait for one extraction instead of repeating it
+inflight_extractions = SingleFlight()
+
+# Coalesces concurrent extractions into shared LLM calls when enabled
+extraction_batcher = ExtractionBatcher(
+    max_batch=Config.LLM_BATCH_SIZE,
+    max_delay_ms=Config.LLM_BATCH_DELAY_MS
+) if Config.LLM_BATCH_SIZE > 1 else None
+
+# Sheds bursts with 429 before they reach the OCR and LLM providers
+rate_limiter = TokenBucket(
+    capacity=Config.MAX_CONCURRENT_REQUESTS,
+    refill_rate=Config.RATE_LIMIT_TOKENS_PER_SECOND
+) if Config.MAX_CONCURRENT_REQUESTS > 0 else None
+
+# Retry-After sent when the bucket cannot say when a token will be back
+# (RATE_LIMIT_TOKENS_PER_SECOND=0 never refills)
+_MAX_RETRY_AFTER = 3600
+
+
+def _retry_after_seconds(tokens: float = 1) -> int:
+    """
+    Whole seconds a client should wait for rate limit tokens
+    
+    Args:
+        tokens: Number of tokens the request needs
+    
+    Returns:
+        Seconds for the Retry-After header, between 1 and _MAX_RETRY_AFTER
+    """
+    wait = rate_limiter.retry_after(tokens)
+    if not math.isfinite(wait):
+        return _MAX_RETRY_AFTER
+    return min(max(1, math.ceil(wait)), _MAX_RETRY_AFTER)
+
+
+# ============================================================================
+# Extraction Pipeline
+# ============================================================================
+
+def _process_document(document_url: str, use_cache: bool = True) -> Tuple[Dict[str, Any], int, Optional[str]]:
+    """
+    Serve one validated document URL from the cache or by extracting it
+    
+    Concurrent requests for the same URL share a single extraction.
+    
+    Args:
+        document_url: Document URL (image or PDF)
+        use_cache: Serve from the response cache and share in-flight work
+    
+    Returns:
+        Tuple of (response_dict, status_code, cache_status) where cache_status
+        is "HIT", "MISS" or None for errors
+    """
+    if not use_cache:
+        return _extract_document(document_url, use_cache=False)
+    
+    cached_response = response_cache.get(document_url)
+    if cached_response is not None:
+        logger.info("🎯 Response cache hit: %.80s...", document_url)
+        return cached_response, 200, "HIT"
+    
+    (response, status_code, cache_status), is_leader = inflight_extractions.run(
+        document_url, _lead_extraction, document_url
+    )
+    if is_leader:
+        return response, status_code, cache_status
+    
+    logger.info("🔗 Shared in-flight extraction: %.80s...", document_url)
+    if status_code == 200:
+        # Same as a cache hit: a copy of the result with no tokens spent
+        return ResponseCache.as_cached(response), 200, "HIT"
+    return response, status_code, cache_status
+
+
+def _lead_extraction(document_url: str) -> Tuple[Dict[str, Any], int, Optional[str]]:
+    """
+    Extract a document as the single-flight leader for its URL
+    
+    A previous leader may have filled the cache and left between our cache
+    miss and taking leadership, so the cache is checked once more first.
+    
+    Args:
+        document_url: Document URL (image or PDF)
+    
+    Returns:
+        Tuple of (response_dict, status_code, cache_status)
+    """
+    cached_response = response_cache.get(document_url)
+    if cached_response is not None:
+        logger.info("🎯 Response cache hit: %.80s...", document_url)
+        return cached_response, 200, "HIT"
+    
+    return _extract_document(document_url, use_cache=True)
+
+
+def _extract_document(document_url: str, use_cache: bool = True) -> Tuple[Dict[str, Any], int, Optional[str]]:
+    """
+    Run the full extraction pipeline for one validated document URL
+    
+    Args:
+        document_url: Document URL (image or PDF)
+        use_cache: Serve page extractions from the extraction cache
+    
+    Returns:
+        Tuple of (response_dict, status_code, cache_status) where cache_status
+        is "MISS" or None for errors
+    """
+    request_start_time = perf_counter()
+    
+    try:
+        logger.debug("📄 Processing document: %.80s...", document_url)
+        
+        
+        # ====== Step 2: OCR Text Extraction (Step A) ======
+        logger.debug("🔍 Step A: Starting OCR extraction...")
+        ocr_pages = ocr_extractor.extract_pages_from_url(document_url)
+        
+        if not any(page.strip() for page in ocr_pages):
+            logger.error("❌ OCR extraction failed or returned empty text")
+            return ResponseFormatter.error_response(
+                "Failed to extract text from document. Ensure document is accessible "
+                "and contains readable text."
+            ), 422, None
+        
+        logger.debug(
+            "✅ OCR extraction successful. Pages: %s, "
+            "text length: %s characters",
+            len(ocr_pages), sum(len(page) for page in ocr_pages)
+        )
+        
+        
+        # ====== Step 3: LLM Information Extraction (Step B) ======
+        logger.debug("🤖 Step B: Starting LLM extraction...")
+        
+        page_results = []
+        input_tok = output_tok = 0
+        
+        if extraction_batcher is not None and len(ocr_pages) == 1:
+            # Shares one LLM call with other requests arriving at the same time
+            extracted_data, input_tok, output_tok = extraction_batcher.submit(
+                ocr_pages[0],
+                use_cache=use_cache,
+                timeout=Config.REQUEST_TIMEOUT
+            )
+            page_results.append(("1", extracted_data))
+        else:
+            # One processor per document so duplicates are tracked across pages
+            llm_processor = LLMProcessor()
+            page_results, input_tok, output_tok = llm_processor.extract_document_pages(
+                ocr_pages,
+                use_cache=use_cache
+            )
+        
+        if not any(data and "line_items" in data for _, data in page_results):
+            logger.error("❌ LLM extraction failed - no data returned")
+            return ResponseFormatter.error_response(
+                "Failed to extract structured data from document"
+            ), 500, None
+        
+        line_items = [
+            item
+            for _, data in page_results
+            for item in data.get("line_items", [])
+        ]
+        logger.debug("✅ LLM extraction successful. Found %s line items", len(line_items))
+        
+        if not line_items:
+            logger.warning("⚠️  No line items found in extraction")
+            return ResponseFormatter.error_response(
+                "No bill line items found in the document. Please verify the document contains line items."
+            ), 422, None
+        
+        
+        # ====== Step 4: Data Validation ======
+        # Items were validated and de-duplicated while parsing the LLM output
+        page_reports = [data["validation"] for _, data in page_results if data.get("validation")]
+        total_raw = sum(report["total_items"] for report in page_reports)
+        valid_raw = sum(report["valid_items"] for report in page_reports)
+        dup_count = sum(report["duplicate_items"] for report in page_reports)
+        quality_score = round(valid_raw / total_raw * 100, 2) if total_raw else 100.0
+        
+        logger.debug(
+            "📊 Validation: %s/%s valid items (%s%%), "
+            "%s duplicates removed",
+            valid_raw, total_raw, quality_score, dup_count
+        )
+        
+        if quality_score < 50:
+            logger.warning("⚠️  Low extraction quality: %s%% of LLM items were invalid or unparseable", quality_score)
+        
+        
+        # ====== Step 5: Format Response ======
+        logger.debug("📝 Formatting response...")
+        
+        pagewise_items = [
+            ResponseFormatter.format_page_items(
+                page_number=page_no,
+                page_type=data.get("page_type", "Bill Detail"),
+                line_items=data.get("line_items", [])
+            )
+            for page_no, data in page_results
+        ]
+        
+        # Every extracted item is formatted, so the count is known up front
+        total_item_count = len(line_items)
+        
+        # Prepare final response
+        response = ResponseFormatter.success_response(
+            pagewise_items=pagewise_items,
+            token_usage={
+                "total_tokens": input_tok + output_tok,
+                "input_tokens": input_tok,
+                "output_tokens": output_tok
+            },
+            total_item_count=total_item_count
+        )
+        
+        
+        # ====== Step 6: Log and Return ======
+        # success_response builds the full schema, so no separate validation pass
+        elapsed_time = perf_counter() - request_start_time
+        # One INFO line per request; the step-by-step trail above is DEBUG
+        logger.info(
+            "✅ Processed %.80s in %.2fs: %s pages, %s items, %s tokens",
+            document_url, elapsed_time, len(pagewise_items), total_item_count,
+            response['token_usage']['total_tokens']
+        )
+        
+        response_cache.put(document_url, response)
+        
+        return response, 200, "MISS"
+    
+    
+    except Exception as e:
+        logger.exception("❌ Unexpected error during extraction: %s", e)
+        return ResponseFormatter.error_response(
+            "Internal server error during document processing"
+        ), 500, None
 
 
 # ============================================================================
@@ -68,9 +327,12 @@ def extract_bill_data():
     
     Request JSON:
         {
-            "document": "https://url-to-document-image.png"
+            "document": "https://url-to-document-image.png"  (image or PDF)
         }
     
+    Query params:
+        nocache=1 bypasses cached results and reprocesses the document
+    
     Response JSON (Success):
         {
             "is_success": true,
@@ -92,11 +354,9 @@ def extract_bill_data():
         }
     """
     
-    request_start_time = __import__('time').time()
-    
     try:
         # ====== Step 1: Parse and Validate Request ======
-        logger.info("📨 Received extraction request")
+        logger.debug("📨 Received extraction request")
         
         request_data = request.get_json()
         
@@ -111,126 +371,169 @@ def extract_bill_data():
         # Validate URL format
         is_valid, error_msg = BillValidator.validate_url(document_url)
         if not is_valid:
-            logger.warning(f"❌ Invalid URL: {error_msg}")
+            logger.warning("❌ Invalid URL: %s", error_msg)
             return jsonify(ResponseFormatter.error_response(error_msg)), 400
         
-        logger.info(f"📄 Processing document: {document_url[:80]}...")
+        use_cache = request.args.get("nocache") != "1"
         
+        response, status_code, cache_status = _process_document(document_url, use_cache)
         
-        # ====== Step 2: OCR Text Extraction (Step A) ======
-        logger.info("🔍 Step A: Starting OCR extraction...")
-        ocr_extractor = OCRExtractor()
-        ocr_text = ocr_extractor.extract_text_from_url(document_url)
-        
-        if not ocr_text or len(ocr_text.strip()) == 0:
-            logger.error("❌ OCR extraction failed or returned empty text")
-            return jsonify(ResponseFormatter.error_response(
-                "Failed to extract text from document. Ensure document is accessible "
-                "and contains readable text."
-            )), 422
-        
-        logger.info(f"✅ OCR extraction successful. Text length: {len(ocr_text)} characters")
-        
+        http_response = jsonify(response)
+        if cache_status:
+            http_response.headers["X-Cache"] = cache_status
+        return http_response, status_code
+    
+    
+    # ========== Error Handling ==========
+    except json.JSONDecodeError:
+        logger.error("❌ Invalid JSON in request body")
+        return jsonify(ResponseFormatter.error_response(
+            "Request body must be valid JSON"
+        )), 400
+    
+    except Exception as e:
+        logger.exception("❌ Unexpected error during extraction: %s", e)
+        return jsonify(ResponseFormatter.error_response(
+            "Internal server error during document processing"
+        )), 500
+
+
+@app.route('/extract-bill-data/batch', methods=['POST'])
+def extract_bill_data_batch():
+    """
+    Batch endpoint extracting several documents in one request
+    
+    Request JSON:
+        {
+            "documents": ["https://url-1.png", "https://url-2.pdf", ...],
+            "continue_on_error": true  (optional, default true)
+        }
+    
+    Response JSON:
+        {
+            "is_success": true,
+            "results": [
+                {"document": "https://url-1.png", "status_code": 200, ...single response...},
+                ...
+            ],
+            "successful": 1,
+            "failed": 0,
+            "total_processed": 1,
+            "processing_time": 3.42
+        }
+    """
+    
+    request_start_time = perf_counter()
+    
+    try:
+        logger.debug("📨 Received batch extraction request")
         
-        # ====== Step 3: LLM Information Extraction (Step B) ======
-        logger.info("🤖 Step B: Starting LLM extraction...")
-        llm_processor = LLMProcessor()
-        llm_processor.reset_token_usage()
-        
-        # Extract line items using Claude
-        extracted_data, input_tok, output_tok = llm_processor.extract_bill_items(
-            ocr_text, 
-            page_number="1"
-        )
+        request_data = request.get_json()
         
-        if not extracted_data or "line_items" not in extracted_data:
-            logger.error("❌ LLM extraction failed - no data returned")
+        if not request_data:
+            logger.warning("❌ Request body is not valid JSON")
             return jsonify(ResponseFormatter.error_response(
-                "Failed to extract structured data from document"
-            )), 500
+                "Request body must be valid JSON"
+            )), 400
         
-        line_items = extracted_data.get("line_items", [])
-        logger.info(f"✅ LLM extraction successful. Found {len(line_items)} line items")
+        documents = request_data.get("documents")
         
-        if not line_items:
-            logger.warning("⚠️  No line items found in extraction")
+        if not isinstance(documents, list) or not documents:
             return jsonify(ResponseFormatter.error_response(
-                "No bill line items found in the document. Please verify the document contains line items."
-            )), 422
-        
-        
-        # ====== Step 4: Data Validation ======
-        logger.info("✔️  Step 3: Starting data validation...")
-        
-        # Validate quality
-        validation_report = BillValidator.validate_extraction_quality(line_items)
-        logger.info(f"📊 Validation report: {validation_report}")
+                "documents must be a non-empty list of URLs"
+            )), 400
         
-        if validation_report["quality_score"] < 50:
-            logger.error(f"❌ Extraction quality too low: {validation_report['quality_score']}%")
+        if len(documents) > Config.MAX_BATCH_DOCUMENTS:
             return jsonify(ResponseFormatter.error_response(
-                f"Extraction quality below threshold. Quality score: {validation_report['quality_score']}%"
-            )), 422
+                f"Too many documents. Maximum {Config.MAX_BATCH_DOCUMENTS} per batch"
+            )), 400
         
-        # Check for duplicates
-        dup_count, dup_details = BillValidator.check_duplicates(line_items)
-        if dup_count > 0:
-            logger.warning(f"⚠️  Found {dup_count} potential duplicate items")
-            logger.debug(f"Duplicate details: {dup_details}")
+        # The rate limit hook charged one token; each extra document costs another
+        if rate_limiter is not None:
+            extra_tokens = min(len(documents), rate_limiter.capacity) - 1
+            if extra_tokens > 0 and not rate_limiter.try_acquire(extra_tokens):
+                retry_after = _retry_after_seconds(extra_tokens)
+                logger.warning("⚠️ Rate limit exceeded for batch of %s", len(documents))
+                response = jsonify(ResponseFormatter.error_response(
+                    "Rate limit exceeded. Please retry later."
+                ))
+                response.headers['Retry-After'] = str(retry_after)
+                return response, 429
         
+        continue_on_error = request_data.get("continue_on_error", True) is not False
+        use_cache = request.args.get("nocache") != "1"
         
-        # ====== Step 5: Format Response ======
-        logger.info("📝 Formatting response...")
+        logger.info("📦 Processing batch of %s documents", len(documents))
         
-        page_type = extracted_data.get("page_type", "Bill Detail")
-        pagewise_items = [
-            ResponseFormatter.format_page_items(
-                page_number="1",
-                page_type=page_type,
-                line_items=line_items
-            )
-        ]
+        results = [None] * len(documents)
+        futures = {}
         
-        # Count total items
-        total_item_count = sum(len(page.get("bill_items", [])) for page in pagewise_items)
+        def stop_pending():
+            """Drop documents that have not started yet"""
+            for pending in futures.values():
+                pending.cancel()
         
-        # Prepare final response
-        response = ResponseFormatter.success_response(
-            pagewise_items=pagewise_items,
-            token_usage=llm_processor.get_token_usage(),
-            total_item_count=total_item_count
-        )
+        with ThreadPoolExecutor(
+            max_workers=min(len(documents), Config.BATCH_CONCURRENCY),
+            thread_name_prefix="batch-extract"
+        ) as executor:
+            stopped = False
+            for index, document_url in enumerate(documents):
+                is_valid, error_msg = BillValidator.validate_url(document_url)
+                if is_valid:
+                    futures[index] = executor.submit(_process_document, document_url, use_cache)
+                    continue
+                
+                results[index] = (ResponseFormatter.error_response(error_msg), 400)
+                
+                # An invalid URL is a failure like any other
+                if not continue_on_error:
+                    stop_pending()
+                    stopped = True
+                    break
+            
+            if not stopped:
+                for index, future in futures.items():
+                    response, status_code, _ = future.result()
+                    results[index] = (response, status_code)
+                    
+                    if status_code != 200 and not continue_on_error:
+                        stop_pending()
+                        break
         
+        # Cancelled documents still ran to completion if they had started
+        for index, future in futures.items():
+            if results[index] is None and not future.cancelled():
+                response, status_code, _ = future.result()
+                results[index] = (response, status_code)
         
-        # ====== Step 6: Validate Response Schema ======
-        if not ResponseFormatter.validate_response_schema(response):
-            logger.error("❌ Response schema validation failed")
-            return jsonify(ResponseFormatter.error_response(
-                "Internal error: Response schema validation failed"
-            )), 500
+        batch_results = []
+        for document_url, result in zip(documents, results):
+            response, status_code = result or (ResponseFormatter.error_response(
+                "Skipped after an earlier document failed"
+            ), 424)
+            batch_results.append({"document": document_url, "status_code": status_code, **response})
         
+        successful = sum(1 for result in batch_results if result["status_code"] == 200)
+        elapsed_time = perf_counter() - request_start_time
         
-        # ====== Step 7: Log and Return ======
-        elapsed_time = __import__('time').time() - request_start_time
-        logger.info(f"✅ Successfully processed document in {elapsed_time:.2f}s")
-        logger.info(f"📊 Total items: {total_item_count}, Tokens used: {response['token_usage']['total_tokens']}")
+        logger.info(
+            "✅ Batch complete: %s/%s succeeded in %.2fs", successful, len(documents), elapsed_time
+        )
         
-        return jsonify(response), 200
-    
-    
-    # ========== Error Handling ==========
-    except json.JSONDecodeError:
-        logger.error("❌ Invalid JSON in request body")
-        return jsonify(ResponseFormatter.error_response(
-            "Request body must be valid JSON"
-        )), 400
+        return jsonify({
+            "is_success": True,
+            "results": batch_results,
+            "successful": successful,
+            "failed": len(batch_results) - successful,
+            "total_processed": len(batch_results),
+            "processing_time": round(elapsed_time, 2)
+        }), 200
     
     except Exception as e:
-        logger.exception(f"❌ Unexpected error during extraction: {e}")
-        import traceback
-        logger.debug(traceback.format_exc())
+        logger.exception("❌ Unexpected error during batch extraction: %s", e)
         return jsonify(ResponseFormatter.error_response(
-            "Internal server error during document processing"
+            "Internal server error during batch processing"
         )), 500
 
 
@@ -263,6 +566,7 @@ def home():
         "status": "🟢 Operational",
         "endpoints": {
             "extract": "/extract-bill-data (POST)",
+            "extract_batch": "/extract-bill-data/batch (POST)",
             "health": "/health (GET)"
         },
         "documentation": "See README.md for detailed documentation",
@@ -275,7 +579,7 @@ def home():
 @app.errorhandler(404)
 def not_found(error):
     """Handle 404 - Not Found errors"""
-    logger.warning(f"404 - Endpoint not found")
+    logger.warning("404 - Endpoint not found")
     return jsonify(ResponseFormatter.error_response(
         "Endpoint not found. See / for available endpoints."
     )), 404
@@ -284,7 +588,7 @@ def not_found(error):
 @app.errorhandler(405)
 def method_not_allowed(error):
     """Handle 405 - Method Not Allowed errors"""
-    logger.warning(f"405 - Method not allowed")
+    logger.warning("405 - Method not allowed")
     return jsonify(ResponseFormatter.error_response(
         "Method not allowed for this endpoint"
     )), 405
@@ -293,7 +597,7 @@ def method_not_allowed(error):
 @app.errorhandler(500)
 def internal_server_error(error):
     """Handle 500 - Internal Server Error"""
-    logger.error(f"500 - Internal server error: {error}")
+    logger.error("500 - Internal server error: %s", error)
     return jsonify(ResponseFormatter.error_response(
         "Internal server error. Please try again later."
     )), 500
@@ -301,18 +605,41 @@ def internal_server_error(error):
 
 # ========== Context Processors ==========
 
+# Paths not logged by the request/response hooks (health checks are polled constantly)
+_SILENT_PATHS = frozenset({'/health'})
+
+
 @app.before_request
 def log_request():
     """Log incoming requests"""
-    if request.path != '/health':  # Don't log health checks
-        logger.debug(f"→ {request.method} {request.path}")
+    if logger.isEnabledFor(logging.DEBUG) and request.path not in _SILENT_PATHS:
+        logger.debug("→ %s %s", request.method, request.path)
+
+
+@app.before_request
+def enforce_rate_limit():
+    """Reject extraction requests once the token bucket is empty"""
+    if rate_limiter is None or not request.path.startswith('/extract-bill-data'):
+        return None
+    
+    if rate_limiter.acquire(timeout=Config.RATE_LIMIT_QUEUE_TIMEOUT):
+        return None
+    
+    retry_after = _retry_after_seconds()
+    logger.warning("⚠️ Rate limit exceeded, retry after %ss", retry_after)
+    
+    response = jsonify(ResponseFormatter.error_response(
+        "Rate limit exceeded. Please retry later."
+    ))
+    response.headers['Retry-After'] = str(retry_after)
+    return response, 429
 
 
 @app.after_request
 def log_response(response):
     """Log outgoing responses"""
-    if request.path != '/health':  # Don't log health checks
-        logger.debug(f"← {response.status_code} {request.method} {request.path}")
+    if logger.isEnabledFor(logging.DEBUG) and request.path not in _SILENT_PATHS:
+        logger.debug("← %s %s %s", response.status_code, request.method, request.path)
     return response
 
 
@@ -320,13 +647,14 @@ def log_response(response):
 # Application Entry Point
 # ============================================================================
 
+# Local development only; production runs under gunicorn (see gunicorn_conf.py)
 if __name__ == '__main__':
     logger.info("=" * 70)
     logger.info("🚀 Bill Data Extraction API Starting...")
     logger.info("=" * 70)
-    logger.info(f"🌐 Server: 0.0.0.0:{Config.PORT}")
-    logger.info(f"🔧 Debug: {Config.DEBUG}")
-    logger.info(f"📌 Environment: {Config.ENVIRONMENT}")
+    logger.info("🌐 Server: 0.0.0.0:%s", Config.PORT)
+    logger.info("🔧 Debug: %s", Config.DEBUG)
+    logger.info("📌 Environment: %s", Config.ENVIRONMENT)
     logger.info("=" * 70)
     logger.info("✅ Ready to accept requests!")
     logger.info("=" * 70)
@@ -334,5 +662,6 @@ if __name__ == '__main__':
     app.run(
         host='0.0.0.0',
         port=Config.PORT,
-        debug=Config.DEBUG
+        debug=Config.DEBUG,
+        threaded=True
     )
\ No newline at end of file
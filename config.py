@@ -4,6 +4,9 @@ Loads settings from environment variables with validation
 """
 
 import os
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping, Optional
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -18,6 +21,14 @@ class Config:
     GROK_MODEL = os.getenv("GROK_MODEL", "llama-3.1-8b-instant")
     MAX_TOKENS = int(os.getenv("MAX_TOKENS", "4000"))
     
+    # Combine up to LLM_BATCH_SIZE concurrent requests into one LLM call (1 disables)
+    LLM_BATCH_SIZE = int(os.getenv("LLM_BATCH_SIZE", "1"))
+    LLM_BATCH_DELAY_MS = int(os.getenv("LLM_BATCH_DELAY_MS", "30"))
+    MAX_BATCH_TOKENS = int(os.getenv("MAX_BATCH_TOKENS", "8000"))
+    
+    # Extract up to LLM_PAGES_PER_CALL pages of a document in one LLM call (1 disables)
+    LLM_PAGES_PER_CALL = int(os.getenv("LLM_PAGES_PER_CALL", "4"))
+    
     # ========== Flask Configuration ==========
     FLASK_ENV = os.getenv("FLASK_ENV", "development")
     DEBUG = os.getenv("FLASK_DEBUG", "False").lower() == "true"
@@ -26,6 +37,9 @@ class Config:
     # ========== OCR Configuration ==========
     OCR_SERVICE = os.getenv("OCR_SERVICE", "tesseract")
     TESSERACT_CMD = os.getenv("TESSERACT_CMD", None)
+    OCR_CONCURRENCY = int(os.getenv("OCR_CONCURRENCY", "4"))  # Pages OCR'd in parallel
+    PDF_DPI = 300
+    MAX_PDF_PAGES = 20
     
     # ========== Logging Configuration ==========
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
@@ -33,8 +47,29 @@ class Config:
     
     # ========== Request Settings ==========
     REQUEST_TIMEOUT = 120  # seconds
+    HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "32"))  # Keep-alive connections per upstream host
     MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB
-    MAX_OCR_CHARS = 8000  # Max OCR chars per API call
+    MAX_OCR_CHARS = int(os.getenv("MAX_OCR_CHARS", "8000"))  # Longer pages are split into chunks
+    OCR_CHUNK_OVERLAP = 200  # Chars of trailing lines repeated in the next chunk
+    LLM_CHUNK_CONCURRENCY = int(os.getenv("LLM_CHUNK_CONCURRENCY", "4"))  # Chunks extracted in parallel
+    LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "4"))  # Page groups of one document extracted in parallel
+    LLM_FORMAT_RETRIES = int(os.getenv("LLM_FORMAT_RETRIES", "1"))  # Re-asks after a reply that is not the requested JSON
+    MAX_BATCH_DOCUMENTS = 64  # Max documents per batch request
+    BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))  # Documents processed in parallel
+    
+    # ========== Cache Settings ==========
+    EXTRACTION_CACHE_SIZE = int(os.getenv("EXTRACTION_CACHE_SIZE", "1024"))  # 0 disables
+    REDIS_URL = os.getenv("REDIS_URL", "")  # Shared extraction cache, empty disables
+    EXTRACTION_CACHE_TTL = int(os.getenv("EXTRACTION_CACHE_TTL", "86400"))  # seconds, Redis tier only
+    REDIS_RETRY_AFTER = float(os.getenv("REDIS_RETRY_AFTER", "30"))  # seconds Redis is skipped after an error
+    RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "10000"))  # 0 disables
+    RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "3600"))  # seconds
+    
+    # ========== Rate Limit Settings ==========
+    MAX_CONCURRENT_REQUESTS = int(os.getenv("MAX_CONCURRENT_REQUESTS", "20"))  # Burst size, 0 disables
+    RATE_LIMIT_TOKENS_PER_SECOND = float(os.getenv("RATE_LIMIT_TOKENS_PER_SECOND", "2"))
+    RATE_LIMIT_QUEUE_TIMEOUT = float(os.getenv("RATE_LIMIT_QUEUE_TIMEOUT", "0"))  # seconds to wait for a token
+    LLM_REQUESTS_PER_MINUTE = int(os.getenv("LLM_REQUESTS_PER_MINUTE", "0"))  # Grok calls per worker process, 0 disables
     
     # ========== Validation Settings ==========
     MIN_CONFIDENCE_SCORE = 0.7
@@ -42,7 +77,11 @@ class Config:
     
     # ========== Response Settings ==========
     JSON_SORT_KEYS = False
-    JSONIFY_PRETTYPRINT_REGULAR = True
+    JSONIFY_PRETTYPRINT_REGULAR = ENVIRONMENT != "production"  # Compact JSON in production
+    
+    # Computed once; settings are read from the environment only at import
+    _validated = False
+    _summary: Optional[Mapping[str, object]] = None
     
     @staticmethod
     def validate_config() -> bool:
@@ -51,10 +90,13 @@ class Config:
         
         Returns:
             True if valid
-            
+        
         Raises:
             ValueError: If configuration is invalid
         """
+        if Config._validated:
+            return True
+        
         if not Config.GROK_API_KEY:
             raise ValueError(
                 "❌ GROK_API_KEY not set. Add to .env:\n"
@@ -66,20 +108,23 @@ class Config:
                 "⚠️  GROK_API_KEY format invalid. Should start with 'gsk_'"
             )
         
+        Config._validated = True
         return True
     
     @staticmethod
-    def get_config_summary() -> dict:
-        """Get configuration summary without sensitive data"""
-        return {
-            "environment": Config.ENVIRONMENT,
-            "debug": Config.DEBUG,
-            "port": Config.PORT,
-            "grok_model": Config.GROK_MODEL,
-            "ocr_service": Config.OCR_SERVICE,
-            "log_level": Config.LOG_LEVEL,
-            "api_key_set": bool(Config.GROK_API_KEY),
-        }
+    def get_config_summary() -> Mapping[str, object]:
+        """Get read-only configuration summary without sensitive data"""
+        if Config._summary is None:
+            Config._summary = MappingProxyType({
+                "environment": Config.ENVIRONMENT,
+                "debug": Config.DEBUG,
+                "port": Config.PORT,
+                "grok_model": Config.GROK_MODEL,
+                "ocr_service": Config.OCR_SERVICE,
+                "log_level": Config.LOG_LEVEL,
+                "api_key_set": bool(Config.GROK_API_KEY),
+            })
+        return Config._summary
 
 
 class DevelopmentConfig(Config):
@@ -93,6 +138,7 @@ class ProductionConfig(Config):
     DEBUG = False
     TESTING = False
     REQUEST_TIMEOUT = 120
+    JSONIFY_PRETTYPRINT_REGULAR = False
 
 
 class TestingConfig(Config):
@@ -106,14 +152,19 @@ def get_config(env: str = None) -> Config:
     """Get configuration based on environment"""
     if env is None:
         env = os.getenv("ENVIRONMENT", "development")
-    
+    return _get_config(env.lower())
+
+
+@lru_cache(maxsize=8)
+def _get_config(env: str) -> Config:
+    """Build the configuration object for a normalized environment name (once per name)"""
     configs = {
         "development": DevelopmentConfig,
         "production": ProductionConfig,
         "testing": TestingConfig,
     }
     
-    return configs.get(env.lower(), DevelopmentConfig)()
+    return configs.get(env, DevelopmentConfig)()
 
 
 if __name__ == "__main__":
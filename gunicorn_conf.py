@@ -0,0 +1,31 @@
+"""
+Gunicorn configuration for production deployment
+Usage: gunicorn -c gunicorn_conf.py app:app
+"""
+
+import os
+
+# ========== Server Socket ==========
+bind = f"0.0.0.0:{os.getenv('PORT', '3000')}"
+
+# ========== Worker Processes ==========
+# Each worker runs Tesseract, so stay conservative on small instances;
+# most waiting (download, LLM call) is absorbed by threads, not workers
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "gthread"
+threads = int(os.getenv("WEB_THREADS", "8"))
+
+# Load the app once in the master and fork workers from it, so config
+# validation, prompts and Tesseract setup run once and memory is shared.
+# Background threads and HTTP clients are created lazily after the fork.
+preload_app = True
+
+# ========== Timeouts ==========
+timeout = 120  # OCR + LLM on a multi-page PDF can take a while
+graceful_timeout = 30
+keepalive = 75  # Longer than typical load balancer idle timeouts
+
+# ========== Logging ==========
+accesslog = "-"
+errorlog = "-"
+loglevel = os.getenv("LOG_LEVEL", "INFO").lower()
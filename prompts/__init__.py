@@ -4,6 +4,6 @@
 Prompt templates for bill extraction
 """
 
-from .extraction_prompts import ExtractionPrompts
+from .extraction_prompts import ExtractionPrompts, PROMPT_VERSION
 
-__all__ = ['ExtractionPrompts']
+__all__ = ['ExtractionPrompts', 'PROMPT_VERSION']
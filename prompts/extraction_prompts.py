@@ -4,80 +4,206 @@ Optimized for accurate bill line item extraction with guardrails
 """
 
 
-from typing import List
+import hashlib
+from typing import Dict, List, Tuple
+
+import orjson
+
+
+# Shared by the single-page and batched extraction prompts. Kept terse:
+# the rules go out with every page, so each token here is paid per request.
+_EXTRACTION_RULES = """<rules>
+- Extract only billed products/services that have an amount.
+- Each item needs item_name (string) and positive item_quantity, item_rate, item_amount (numbers).
+- item_amount must roughly equal item_quantity * item_rate.
+- List each item once.
+- Report subtotal and total rows only in subtotal / page_total.
+</rules>
+<skip>dates, times, invoice/reference/customer/patient IDs, page numbers, amount-due labels, subtotal and total rows</skip>
+"""
+
+_ITEM_SCHEMA = '{"item_name":"...","item_quantity":1.0,"item_rate":0.0,"item_amount":0.0}'
+
+
+# Static parts of the single-page extraction prompt, built once at import.
+# The instructions come before any per-request value, so the prompt prefix
+# is identical across requests and eligible for provider-side prefix caching.
+_EXTRACTION_INSTRUCTIONS = f"""Extract the line items from one page of a bill.
+
+{_EXTRACTION_RULES}<schema>
+{{"line_items":[{_ITEM_SCHEMA}],"subtotal":null,"page_total":null}}
+</schema>
+Reply with only this JSON."""
+
+_PAGE_HEAD = "<text page="
+
+_PROMPT_MIDDLE = ">\n"
+
+_PROMPT_TAIL = "\n</text>"
+
+
+# Instructions for the combined prompts. Like the single-page instructions
+# they hold no per-request values (not even the document count), so they can
+# be sent as an unchanging system message.
+_BATCH_INSTRUCTIONS = f"""Extract the line items from each of these unrelated bills. Each is in a <doc id="..."> tag; never move items between documents.
+
+{_EXTRACTION_RULES}<schema>
+{{"documents":[{{"id":"<doc id>","line_items":[{_ITEM_SCHEMA}],"subtotal":null,"page_total":null}}]}}
+</schema>
+Reply with only this JSON, one entry per document."""
+
+_MULTIPAGE_INSTRUCTIONS = f"""Extract the line items from each page of one bill. Pages are in <page n="..."> tags; report every item under the page it appears on.
+
+{_EXTRACTION_RULES}<schema>
+{{"pages":[{{"page_no":"<n>","line_items":[{_ITEM_SCHEMA}],"subtotal":null,"page_total":null}}]}}
+</schema>
+Reply with only this JSON, one entry per page."""
+
+
+# Static parts of the remaining prompts; only the interpolated values are
+# joined in per call
+_FORMAT_FEEDBACK_HEAD = "Your reply could not be used: "
+
+_FORMAT_FEEDBACK_TAIL = ". Reply again with only the JSON described in the schema."
+
+_VALIDATION_HEAD = "Check this bill extraction against the bill text.\n\n<text>\n"
+
+_VALIDATION_MIDDLE = "\n</text>\n<items>\n"
+
+_VALIDATION_TAIL = """
+</items>
+Check: items are products/services (not dates, IDs or metadata), amounts are plausible, nothing is double-counted, nothing in the text is missing.
+Reply with only JSON: {"is_valid":true,"issues":[],"confidence":0.0,"corrections_needed":false}"""
+
+_RECONCILIATION_HEAD = "Reconcile the extracted items with the bill total.\n\n<items>\n"
+
+_RECONCILIATION_CLAIMED = "\n</items>\nClaimed total: "
+
+_RECONCILIATION_MIDDLE = """
+Sum item_amount and compare with the claimed total. Status: perfect if variance < 0.01, acceptable if < 1%, otherwise needs_review.
+Reply with only JSON: {"calculated_total":0.0,"claimed_total":"""
+
+_RECONCILIATION_TAIL = ',"variance":0.0,"variance_percentage":0.0,"status":"perfect|acceptable|needs_review","notes":""}'
+
+_DEDUP_HEAD = "Find duplicate items across two bill pages.\n\n<page1>\n"
+
+_DEDUP_MIDDLE = "\n</page1>\n<page2>\n"
+
+_DEDUP_TAIL = """
+</page2>
+Compare item_name, item_amount and item_quantity. Exact duplicates match on all three; similar items share a name but differ in amount. Repeat purchases can be legitimate.
+Reply with only JSON: {"exact_duplicates":[{"page1_item":{},"page2_item":{},"reason":""}],"similar_items":[{"page1_item":{},"page2_item":{},"reason":""}],"duplicates_to_remove":[],"recommendation":"keep all|remove page2|review manually"}"""
+
+
+# Digest of the static extraction instructions, computed once at import.
+# Cached extractions are keyed on it so results produced by an older
+# prompt are never served after the prompt changes.
+PROMPT_VERSION = hashlib.sha256(
+    "\0".join((_EXTRACTION_INSTRUCTIONS, _BATCH_INSTRUCTIONS, _MULTIPAGE_INSTRUCTIONS)).encode()
+).hexdigest()[:16]
+
+
+def _to_jsonl(items: List[dict]) -> str:
+    """Serialize items as JSON Lines, one compact object per line (fewer tokens than a Python repr)"""
+    return "\n".join(orjson.dumps(item).decode() for item in items)
+
+
+def _batch_sections(documents: List[Tuple[str, str]]) -> str:
+    """Wrap each document's OCR text in a <doc id="..."> tag"""
+    return "\n\n".join(
+        f'<doc id="{doc_id}">\n{ocr_text}\n</doc>'
+        for doc_id, ocr_text in documents
+    )
+
+
+def _page_sections(pages: List[Tuple[str, str]]) -> str:
+    """Wrap each page's OCR text in a <page n="..."> tag"""
+    return "\n\n".join(
+        f'<page n="{page_number}">\n{ocr_text}\n</page>'
+        for page_number, ocr_text in pages
+    )
 
 
 class ExtractionPrompts:
     """Centralized prompt management for bill extraction"""
     
     @staticmethod
-    def get_extraction_prompt(ocr_text: str, page_number: str = "1") -> str:
+    def get_extraction_messages(ocr_text: str, page_number: str = "1") -> List[Dict[str, str]]:
         """
-        Generate extraction prompt for Grok API
+        Generate chat messages for single-page extraction
+        
+        The instructions go in a constant system message and only the page
+        text goes in the user message, so the cacheable prefix is explicit.
         
         Args:
             ocr_text: OCR-extracted text from bill
             page_number: Current page number
-            
+        
         Returns:
-            Extraction prompt string
+            List of message dictionaries (role, content)
         """
-        return f"""You are an expert bill data extraction AI. Extract line items from bills with 100% accuracy.
-
-CRITICAL RULES - MUST FOLLOW:
-1. EXTRACT ONLY monetary line items (products/services with amounts)
-2. NEVER extract as line items:
-   - Invoice dates, times (e.g., "2024-01-15", "14:30")
-   - Invoice/reference numbers (e.g., "INV-001", "REF-123", "BILL-456")
-   - Customer IDs or patient IDs (e.g., "CUST-789", "PAT-001")
-   - Page numbers, amounts due labels
-   - Subtotal rows or grand total rows (extract separately if present)
-3. Each line item MUST have all 4 fields:
-   - item_name: Product/service name (string)
-   - item_quantity: Number of units (float, positive)
-   - item_rate: Price per unit (float, positive)
-   - item_amount: Total amount for item (float, positive)
-4. Validate: item_amount should approximately equal item_quantity × item_rate
-
-GUARDRAILS - PREVENT ERRORS:
-✓ "Paracetamol 500mg Tab" → Valid product name
-✗ "2024-01-15" → Date, not product
-✗ "INV-12345" → Invoice number, not product
-✗ "Total" → Metadata, not product
-✓ amount_fields must be > 0
-
-PAGE CONTEXT:
-This is page {page_number} of the bill. Extract all line items visible.
-
-RESPONSE FORMAT - Return ONLY valid JSON:
-{{
-  "page_type": "Bill Detail|Final Bill|Pharmacy",
-  "line_items": [
-    {{
-      "item_name": "Product name",
-      "item_quantity": 10.0,
-      "item_rate": 50.25,
-      "item_amount": 502.50
-    }}
-  ],
-  "subtotal": null,
-  "page_total": null,
-  "notes": "Any extraction notes"
-}}
-
-VALIDATION CHECKLIST BEFORE OUTPUT:
-□ All item_names are products/services (NOT dates, IDs, metadata)
-□ All item_names are unique within this response
-□ All quantities, rates, amounts are positive numbers
-□ Amount ≈ Quantity × Rate for each item
-□ No duplicate items in response
-□ Valid JSON format
-
-BILL TEXT (PAGE {page_number}):
-{ocr_text}
-
-Extract now. Return ONLY the JSON, no preamble or explanation:"""
-
+        page_text = "".join((
+            _PAGE_HEAD, str(page_number),
+            _PROMPT_MIDDLE, ocr_text,
+            _PROMPT_TAIL
+        ))
+        return [
+            {"role": "system", "content": _EXTRACTION_INSTRUCTIONS},
+            {"role": "user", "content": page_text}
+        ]
+    
+    @staticmethod
+    def get_batch_extraction_messages(documents: List[Tuple[str, str]]) -> List[Dict[str, str]]:
+        """
+        Generate chat messages for extracting several documents in one call
+        
+        Args:
+            documents: List of (document_id, ocr_text) tuples
+        
+        Returns:
+            List of message dictionaries (role, content)
+        """
+        return [
+            {"role": "system", "content": _BATCH_INSTRUCTIONS},
+            {"role": "user", "content": _batch_sections(documents)}
+        ]
+    
+    @staticmethod
+    def get_multipage_extraction_messages(pages: List[Tuple[str, str]]) -> List[Dict[str, str]]:
+        """
+        Generate chat messages for extracting several pages of one bill in one call
+        
+        Args:
+            pages: List of (page_number, ocr_text) tuples in page order
+        
+        Returns:
+            List of message dictionaries (role, content)
+        """
+        return [
+            {"role": "system", "content": _MULTIPAGE_INSTRUCTIONS},
+            {"role": "user", "content": _page_sections(pages)}
+        ]
+    
+    @staticmethod
+    def get_format_feedback_messages(reply: str, problem: str) -> List[Dict[str, str]]:
+        """
+        Generate the messages that send a malformed reply back to the model
+        
+        Appended to the original messages so the model sees its own reply
+        and what was wrong with it.
+        
+        Args:
+            reply: The model's unusable reply
+            problem: Short description of what was wrong
+        
+        Returns:
+            List of message dictionaries (role, content)
+        """
+        return [
+            {"role": "assistant", "content": reply},
+            {"role": "user", "content": _FORMAT_FEEDBACK_HEAD + problem + _FORMAT_FEEDBACK_TAIL}
+        ]
+    
     @staticmethod
     def get_validation_prompt(extracted_items: List[dict], ocr_text: str) -> str:
         """
@@ -90,29 +216,12 @@ Extract now. Return ONLY the JSON, no preamble or explanation:"""
         Returns:
             Validation prompt string
         """
-        return f"""Validate this bill extraction for accuracy.
-
-ORIGINAL BILL TEXT:
-{ocr_text}
-
-EXTRACTED LINE ITEMS:
-{extracted_items}
-
-VALIDATION CHECKS:
-1. Are all item_names actual products/services?
-2. Are any item_names dates, IDs, or metadata?
-3. Do all amounts seem reasonable?
-4. Is there any obvious double-counting?
-5. Are there missing items from the original bill?
-
-Return ONLY JSON:
-{{
-  "is_valid": true|false,
-  "issues": ["list of issues if any"],
-  "confidence": 0.0-1.0,
-  "corrections_needed": false|true
-}}"""
-
+        return "".join((
+            _VALIDATION_HEAD, ocr_text,
+            _VALIDATION_MIDDLE, _to_jsonl(extracted_items),
+            _VALIDATION_TAIL
+        ))
+    
     @staticmethod
     def get_reconciliation_prompt(
         all_items: List[dict],
@@ -128,34 +237,14 @@ Return ONLY JSON:
         Returns:
             Reconciliation prompt string
         """
-        return f"""Reconcile extracted items with bill total.
-
-EXTRACTED ITEMS:
-{all_items}
-
-CLAIMED BILL TOTAL: {claimed_total}
-
-RECONCILIATION TASK:
-1. Calculate sum of all item_amounts
-2. Compare with claimed total
-3. Calculate variance and percentage
-4. Determine if match is acceptable
-
-Return ONLY JSON:
-{{
-  "calculated_total": 0.0,
-  "claimed_total": {claimed_total},
-  "variance": 0.0,
-  "variance_percentage": 0.0,
-  "status": "perfect|acceptable|needs_review",
-  "notes": "explanation"
-}}
-
-Status guidelines:
-- perfect: variance < ₹0.01
-- acceptable: variance < 1%
-- needs_review: variance >= 1%
-"""
+        # Rendered once as currency: 1234.5678 -> "1234.57"
+        claimed_total = format(claimed_total, ".2f")
+        return "".join((
+            _RECONCILIATION_HEAD, _to_jsonl(all_items),
+            _RECONCILIATION_CLAIMED, claimed_total,
+            _RECONCILIATION_MIDDLE, claimed_total,
+            _RECONCILIATION_TAIL
+        ))
     
     @staticmethod
     def get_deduplication_check_prompt(items_page1: List[dict], items_page2: List[dict]) -> str:
@@ -169,28 +258,8 @@ Status guidelines:
         Returns:
             Deduplication prompt string
         """
-        return f"""Check for duplicate items across pages.
-
-PAGE 1 ITEMS:
-{items_page1}
-
-PAGE 2 ITEMS:
-{items_page2}
-
-DUPLICATE CHECK:
-1. Compare by: item_name, item_amount, item_quantity
-2. Identify exact duplicates (same values)
-3. Flag similar items (same name, different amounts)
-4. Determine if duplicates are legitimate (e.g., multiple purchases)
-
-Return ONLY JSON:
-{{
-  "exact_duplicates": [
-    {{"page1_item": {{}}, "page2_item": {{}}, "reason": "exact match"}}
-  ],
-  "similar_items": [
-    {{"page1_item": {{}}, "page2_item": {{}}, "reason": "same name, different amount"}}
-  ],
-  "duplicates_to_remove": ["item names to deduplicate"],
-  "recommendation": "keep all|remove page2|review manually"
-}}"""
\ No newline at end of file
+        return "".join((
+            _DEDUP_HEAD, _to_jsonl(items_page1),
+            _DEDUP_MIDDLE, _to_jsonl(items_page2),
+            _DEDUP_TAIL
+        ))
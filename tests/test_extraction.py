@@ -5,22 +5,32 @@ Tests for validators, response formatters, and API endpoints
 
 import pytest
 import json
+import orjson
 from unittest.mock import patch, MagicMock
 from app import app
 from utils.validators import BillValidator
 from utils.response_formatter import ResponseFormatter
+from utils.extraction_cache import ExtractionCache
+from utils.response_cache import ResponseCache
+from utils.llm_processor import LLMProcessor, GrokAPIClient
+from utils.batcher import ExtractionBatcher
+from utils.ocr_extractor import OCRExtractor
+from utils.rate_limit import TokenBucket
+from utils.single_flight import SingleFlight
+from utils.json_provider import OrjsonProvider
+from prompts.extraction_prompts import ExtractionPrompts, PROMPT_VERSION
+from config import Config, get_config
 
 
 # ============================================================================
 # FIXTURES
 # ============================================================================
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def client():
-    """Create test client for API testing"""
+    """Create test client for API testing (shared; the API keeps no session state)"""
     app.config['TESTING'] = True
-    with app.test_client() as client:
-        yield client
+    return app.test_client()
 
 
 @pytest.fixture
@@ -83,6 +93,14 @@ def sample_response():
     }
 
 
+@pytest.fixture
+def clean_extraction_cache():
+    """Empty the class-level extraction cache before and after the test"""
+    LLMProcessor.extraction_cache.clear()
+    yield LLMProcessor.extraction_cache
+    LLMProcessor.extraction_cache.clear()
+
+
 # ============================================================================
 # TESTS: URL VALIDATION
 # ============================================================================
@@ -90,45 +108,37 @@ def sample_response():
 class TestURLValidation:
     """Tests for URL validation"""
     
-    def test_validate_url_valid_https(self):
-        """Test URL validation with valid HTTPS URL"""
-        is_valid, msg = BillValidator.validate_url("https://example.com/bill.png")
-        assert is_valid is True
-        assert msg == ""
-    
-    def test_validate_url_valid_http(self):
-        """Test URL validation with valid HTTP URL"""
-        is_valid, msg = BillValidator.validate_url("http://example.com/bill.png")
-        assert is_valid is True
-        assert msg == ""
-    
-    def test_validate_url_empty(self):
-        """Test URL validation with empty string"""
-        is_valid, msg = BillValidator.validate_url("")
-        assert is_valid is False
-        assert "required" in msg.lower()
-    
-    def test_validate_url_none(self):
-        """Test URL validation with None"""
-        is_valid, msg = BillValidator.validate_url(None)
-        assert is_valid is False
-    
-    def test_validate_url_no_protocol(self):
-        """Test URL validation without protocol"""
-        is_valid, msg = BillValidator.validate_url("example.com/bill.png")
-        assert is_valid is False
-        assert "http" in msg.lower()
-    
-    def test_validate_url_invalid_type(self):
-        """Test URL validation with non-string type"""
-        is_valid, msg = BillValidator.validate_url(12345)
-        assert is_valid is False
+    @pytest.mark.parametrize("url, expected_valid, message_part", [
+        ("https://example.com/bill.png", True, None),
+        ("http://example.com/bill.png", True, None),
+        ("", False, "required"),
+        (None, False, None),
+        ("example.com/bill.png", False, "http"),
+        (12345, False, None),
+        ("https://example.com/" + "a" * 2000, False, None),
+        ("https://exa mple.com/bill.png", False, None),
+        ("https:///bill.png", False, None),
+        ("ftp://example.com/bill.png", False, None),
+    ], ids=["valid_https", "valid_http", "empty", "none", "no_protocol", "invalid_type",
+            "too_long", "whitespace", "missing_host", "other_protocol"])
+    def test_validate_url(self, url, expected_valid, message_part):
+        """Test URL validation for valid and malformed URLs"""
+        is_valid, msg = BillValidator.validate_url(url)
+        assert is_valid is expected_valid
+        if expected_valid:
+            assert msg == ""
+        if message_part:
+            assert message_part in msg.lower()
     
-    def test_validate_url_too_long(self):
-        """Test URL validation with excessively long URL"""
-        long_url = "https://example.com/" + "a" * 2000
-        is_valid, msg = BillValidator.validate_url(long_url)
-        assert is_valid is False
+    def test_validate_url_repeats_are_cached(self):
+        """Test repeated URLs are answered from the validation cache"""
+        from utils.validators import _check_url
+        url = "https://example.com/repeat-bill.png"
+        BillValidator.validate_url(url)
+        hits_before = _check_url.cache_info().hits
+        
+        assert BillValidator.validate_url(url) == (True, "")
+        assert _check_url.cache_info().hits == hits_before + 1
 
 
 # ============================================================================
@@ -138,33 +148,18 @@ class TestURLValidation:
 class TestAmountValidation:
     """Tests for amount validation"""
     
-    def test_validate_amount_float(self):
-        """Test amount validation with float"""
-        assert BillValidator.validate_amount(100.50) is True
-    
-    def test_validate_amount_int(self):
-        """Test amount validation with integer"""
-        assert BillValidator.validate_amount(100) is True
-    
-    def test_validate_amount_string_valid(self):
-        """Test amount validation with valid string"""
-        assert BillValidator.validate_amount("100.50") is True
-    
-    def test_validate_amount_negative(self):
-        """Test amount validation with negative number"""
-        assert BillValidator.validate_amount(-50) is False
-    
-    def test_validate_amount_zero(self):
-        """Test amount validation with zero"""
-        assert BillValidator.validate_amount(0) is True
-    
-    def test_validate_amount_invalid_string(self):
-        """Test amount validation with invalid string"""
-        assert BillValidator.validate_amount("invalid") is False
-    
-    def test_validate_amount_none(self):
-        """Test amount validation with None"""
-        assert BillValidator.validate_amount(None) is False
+    @pytest.mark.parametrize("amount, expected", [
+        (100.50, True),
+        (100, True),
+        ("100.50", True),
+        (-50, False),
+        (0, True),
+        ("invalid", False),
+        (None, False),
+    ], ids=["float", "int", "string_valid", "negative", "zero", "invalid_string", "none"])
+    def test_validate_amount(self, amount, expected):
+        """Test amount validation for numbers, numeric strings and invalid values"""
+        assert BillValidator.validate_amount(amount) is expected
 
 
 # ============================================================================
@@ -225,6 +220,14 @@ class TestLineItemValidation:
         is_valid, msg = BillValidator.validate_line_item(item)
         assert is_valid is False
     
+    def test_metadata_check_repeats_are_cached(self):
+        """Test repeated item names are answered from the metadata cache"""
+        BillValidator._is_metadata_value("Repeat Medicine 10mg")
+        hits_before = BillValidator._is_metadata_value.cache_info().hits
+        
+        assert BillValidator._is_metadata_value("Repeat Medicine 10mg") is False
+        assert BillValidator._is_metadata_value.cache_info().hits == hits_before + 1
+    
     def test_validate_line_item_negative_amount(self):
         """Test line item with negative amount"""
         item = {
@@ -319,6 +322,16 @@ class TestDuplicateDetection:
         ]
         dup_count, dup_details = BillValidator.check_duplicates(items)
         assert dup_count == 1
+    
+    def test_check_duplicates_casefold_and_rounding(self):
+        """Test Unicode case variants and sub-cent float noise still count as duplicates"""
+        items = [
+            {"item_name": "Gauze STRASSE", "item_amount": 100.0, "item_quantity": 1.0},
+            {"item_name": "gauze straße", "item_amount": 100.001, "item_quantity": 1.0}
+        ]
+        dup_count, dup_details = BillValidator.check_duplicates(items)
+        assert dup_count == 1
+        assert dup_details[0]["first_occurrence"] is items[0]
 
 
 # ============================================================================
@@ -351,6 +364,33 @@ class TestTotalReconciliation:
         items = [{"item_amount": 100.0}]
         result = BillValidator.reconcile_totals(items, 0)
         assert result["calculated_total"] == 100.0
+    
+    def test_reconcile_totals_ignores_float_noise(self):
+        """Test sub-cent differences from summing floats still count as a match"""
+        items = [{"item_amount": 0.1}, {"item_amount": 0.2}]
+        result = BillValidator.reconcile_totals(items, 0.3)
+        assert result["status"] == "perfect_match"
+    
+    def test_reconcile_totals_tolerance_tiers(self, sample_items):
+        """Test relative tolerance tiers around the 550.00 extracted total"""
+        statuses = [
+            BillValidator.reconcile_totals(sample_items, claimed)["status"]
+            for claimed in (553.0, 570.0, 700.0)
+        ]
+        assert statuses == ["acceptable", "needs_review", "significant_discrepancy"]
+    
+    def test_reconcile_status_agrees_with_variance_percentage(self, sample_items):
+        """Test tiers use the claimed total, the base of variance_percentage"""
+        # 5.49 is under 1% of the 550.00 extracted total but over 1% of the claim
+        result = BillValidator.reconcile_totals(sample_items, 544.51)
+        assert result["variance_percentage"] == 1.01
+        assert result["status"] == "needs_review"
+    
+    def test_reconcile_mismatch_against_zero_claim(self, sample_items):
+        """Test items against a zero claimed total are a significant discrepancy"""
+        result = BillValidator.reconcile_totals(sample_items, 0.0)
+        assert result["variance_percentage"] == 0
+        assert result["status"] == "significant_discrepancy"
 
 
 # ============================================================================
@@ -382,6 +422,23 @@ class TestExtractionQuality:
         report = BillValidator.validate_extraction_quality([])
         assert report["total_items"] == 0
         assert report["quality_score"] == 0
+    
+    def test_parsing_reports_quality_in_one_pass(self):
+        """Test LLM output parsing validates and de-duplicates items together"""
+        processor = LLMProcessor()
+        items, report = processor._process_line_items([
+            {"item_name": "Medicine A", "item_amount": 100.0, "item_rate": 50.0, "item_quantity": 2.0},
+            {"item_name": "medicine a", "item_amount": 100.0, "item_rate": 50.0, "item_quantity": 2.0},
+            {"item_name": "Subtotal", "item_amount": 100.0, "item_rate": 0, "item_quantity": 0},
+            {"item_name": "Test B", "item_amount": "abc", "item_rate": 10.0, "item_quantity": 1.0}
+        ], "1")
+        
+        assert [item.item_name for item in items] == ["Medicine A"]
+        assert report["total_items"] == 4
+        assert report["valid_items"] == 2
+        assert report["duplicate_items"] == 1
+        assert report["quality_score"] == 50.0
+        assert len(report["warnings"]) == 2
 
 
 # ============================================================================
@@ -434,6 +491,18 @@ class TestResponseFormatting:
         assert cleaned["item_name"] == "Medicine A"
         assert cleaned["item_amount"] == 100.50
     
+    def test_format_page_items_drops_malformed_items(self):
+        """Test page formatting cleans currency strings and drops unparseable items"""
+        items = [
+            {"item_name": " Medicine ", "item_amount": "₹1,000.50", "item_rate": "500.25", "item_quantity": "2"},
+            {"item_name": "Broken", "item_amount": "n/a", "item_rate": 10.0, "item_quantity": 1.0}
+        ]
+        page = ResponseFormatter.format_page_items("1", "Bill Detail", items)
+        
+        assert page["bill_items"] == [
+            {"item_name": "Medicine", "item_amount": 1000.50, "item_rate": 500.25, "item_quantity": 2.0}
+        ]
+    
     def test_to_float_conversion_string(self):
         """Test float conversion from string"""
         assert ResponseFormatter._to_float("100.50") == 100.50
@@ -492,6 +561,901 @@ class TestSchemaValidation:
         """Test validation of valid error response"""
         response = {"is_success": False, "message": "Error message"}
         assert ResponseFormatter.validate_response_schema(response) is True
+    
+    def test_formatter_output_always_matches_schema(self, sample_items):
+        """Test responses built by the formatter need no separate validation"""
+        page = ResponseFormatter.format_page_items("1", "Bill Detail", sample_items)
+        response = ResponseFormatter.success_response(
+            pagewise_items=[page],
+            token_usage={"input_tokens": 10},
+            total_item_count=len(sample_items)
+        )
+        
+        assert ResponseFormatter.validate_response_schema(response) is True
+        assert response["token_usage"] == {"total_tokens": 0, "input_tokens": 10, "output_tokens": 0}
+
+
+# ============================================================================
+# TESTS: MULTI-PAGE DOCUMENTS
+# ============================================================================
+
+class TestMultiPageDocuments:
+    """Tests for page-wise OCR and extraction"""
+    
+    def test_ocr_pages_keep_document_order(self):
+        """Test concurrently OCR'd pages come back in page order"""
+        from PIL import Image
+        extractor = OCRExtractor()
+        pages = [Image.new('RGB', (10, 10), color) for color in ('red', 'green', 'blue')]
+        
+        with patch.object(extractor, '_get_session') as get_session, \
+             patch.object(extractor, '_load_pages', return_value=pages), \
+             patch.object(extractor, '_extract_with_tesseract',
+                          side_effect=lambda image: str(image.getpixel((0, 0)))):
+            texts = extractor.extract_pages_from_url("https://example.com/bill.pdf")
+        
+        assert get_session.return_value.get.call_count == 1
+        assert texts == ["(255, 0, 0)", "(0, 128, 0)", "(0, 0, 255)"]
+    
+    @pytest.mark.usefixtures("clean_extraction_cache")
+    def test_endpoint_returns_items_per_page(self, client):
+        """Test each OCR page becomes its own pagewise entry"""
+        llm_outputs = [
+            (json.dumps({"line_items": [{"item_name": name, "item_amount": 10.0,
+                                         "item_rate": 10.0, "item_quantity": 1.0}]}), 50, 10)
+            for name in ("Consultation", "Paracetamol 500mg")
+        ]
+        
+        with patch('app.ocr_extractor') as ocr, \
+             patch('utils.llm_processor.Config.LLM_PAGES_PER_CALL', 1), \
+             patch('utils.llm_processor.GrokAPIClient.call', side_effect=llm_outputs):
+            ocr.extract_pages_from_url.return_value = ["page one text", "page two text"]
+            response = client.post('/extract-bill-data?nocache=1',
+                                   json={"document": "https://example.com/two-pages.pdf"})
+        
+        data = orjson.loads(response.data)
+        assert response.status_code == 200
+        assert [page["page_no"] for page in data["data"]["pagewise_line_items"]] == ["1", "2"]
+        assert data["data"]["total_item_count"] == 2
+        assert data["token_usage"]["total_tokens"] == 120
+    
+    @pytest.mark.usefixtures("clean_extraction_cache")
+    def test_pages_share_one_llm_call(self):
+        """Test short pages are extracted together and cross-page duplicates still dropped"""
+        processor = LLMProcessor()
+        item = {"item_name": "Consultation", "item_amount": 500.0, "item_rate": 500.0, "item_quantity": 1.0}
+        other = {"item_name": "Paracetamol 500mg", "item_amount": 20.0, "item_rate": 2.0, "item_quantity": 10.0}
+        llm_output = json.dumps({"pages": [
+            {"page_no": "1", "line_items": [item]},
+            {"page_no": "2", "line_items": [other]},
+            {"page_no": "3", "line_items": [item]},
+        ]})
+        
+        with patch.object(processor.api_client, 'call', return_value=(llm_output, 300, 60)) as call:
+            pages, input_tok, output_tok = processor.extract_document_pages(
+                ["page one", "page two", "page three"], use_cache=False
+            )
+        
+        assert call.call_count == 1
+        assert '<page n="3">\npage three\n</page>' in call.call_args.args[0][-1]["content"]
+        assert [page_no for page_no, _ in pages] == ["1", "2", "3"]
+        assert (input_tok, output_tok) == (300, 60)
+        assert pages[2][1]["line_items"] == []
+        assert pages[2][1]["validation"]["duplicate_items"] == 1
+    
+    @pytest.mark.usefixtures("clean_extraction_cache")
+    def test_page_missing_from_combined_call_extracted_alone(self):
+        """Test a page the combined response skipped gets its own call"""
+        processor = LLMProcessor()
+        item = {"item_name": "Consultation", "item_amount": 500.0, "item_rate": 500.0, "item_quantity": 1.0}
+        outputs = [
+            (json.dumps({"pages": [{"page_no": "1", "line_items": [item]}]}), 200, 40),
+            (json.dumps({"line_items": [dict(item, item_name="X-Ray")]}), 100, 20),
+        ]
+        
+        with patch.object(processor.api_client, 'call', side_effect=outputs) as call:
+            pages, input_tok, output_tok = processor.extract_document_pages(["page one", "page two"], use_cache=False)
+        
+        assert call.call_count == 2
+        assert [data["line_items"][0]["item_name"] for _, data in pages] == ["Consultation", "X-Ray"]
+        assert (input_tok, output_tok) == (300, 60)
+    
+    @pytest.mark.usefixtures("clean_extraction_cache")
+    def test_page_requests_overlap_but_dedup_in_page_order(self):
+        """Test separate page calls are in flight together and duplicates still drop from later pages"""
+        import threading
+        processor = LLMProcessor()
+        item = {"item_name": "Consultation", "item_amount": 500.0, "item_rate": 500.0, "item_quantity": 1.0}
+        both_in_flight = threading.Barrier(2, timeout=5)
+        
+        def call(messages, **kwargs):
+            both_in_flight.wait()
+            return json.dumps({"line_items": [item]}), 100, 20
+        
+        with patch('utils.llm_processor.Config.LLM_PAGES_PER_CALL', 1), \
+             patch.object(processor.api_client, 'call', side_effect=call):
+            pages, input_tok, output_tok = processor.extract_document_pages(["page one", "page two"], use_cache=False)
+        
+        assert [len(data["line_items"]) for _, data in pages] == [1, 0]
+        assert (input_tok, output_tok) == (200, 40)
+        assert processor.get_token_usage()["total_tokens"] == 240
+    
+    @pytest.mark.parametrize("reply", [
+        '{"line_items": []}',
+        '```json\n{"line_items": []}\n```',
+        'Here are the items:\n{"line_items": []}\nLet me know if you need more.',
+    ], ids=["bare", "fenced", "with_prose"])
+    def test_parse_json_response_variants(self, reply):
+        """Test LLM replies parse with or without fences and surrounding prose"""
+        assert LLMProcessor()._parse_json_response(reply) == {"line_items": []}
+
+
+# ============================================================================
+# TESTS: GROK API CLIENT
+# ============================================================================
+
+class TestGrokAPIClient:
+    """Tests for the pooled, rate-limited Grok HTTP client"""
+    
+    def test_upstream_clients_reuse_pooled_sessions(self):
+        """Test downloads and LLM calls go through long-lived sessions"""
+        extractor = OCRExtractor()
+        assert extractor._get_session() is extractor._get_session()
+        
+        client = LLMProcessor.get_api_client()
+        adapter = client.session.get_adapter(client.base_url)
+        assert adapter._pool_maxsize == Config.HTTP_POOL_SIZE
+    
+    def test_llm_auth_headers_set_once_on_session(self):
+        """Test the API key travels in session headers instead of being rebuilt per call"""
+        client = GrokAPIClient("gsk_test")
+        reply = MagicMock()
+        reply.content = orjson.dumps({"choices": [{"message": {"content": "{}"}}], "usage": {}})
+        
+        with patch.object(client.session, 'post', return_value=reply) as post:
+            client.call([{"role": "user", "content": "x"}])
+        
+        assert client.session.headers["Authorization"] == "Bearer gsk_test"
+        assert "headers" not in post.call_args.kwargs
+        
+        client.close()
+    
+    def test_llm_request_body_encoded_once_across_retries(self):
+        """Test a retried LLM call resends the same pre-encoded body"""
+        import requests
+        client = GrokAPIClient("gsk_test")
+        reply = MagicMock()
+        reply.content = orjson.dumps({
+            "choices": [{"message": {"content": "{}"}}],
+            "usage": {"prompt_tokens": 5, "completion_tokens": 1}
+        })
+        messages = [{"role": "user", "content": "Medicine A 250.00"}]
+        
+        with patch.object(client.session, 'post', side_effect=[requests.exceptions.Timeout(), reply]) as post, \
+             patch('utils.llm_processor.time.sleep'):
+            assert client.call(messages) == ("{}", 5, 1)
+        
+        first, second = (c.kwargs["data"] for c in post.call_args_list)
+        assert first is second
+        assert json.loads(first)["messages"] == messages
+    
+    def test_llm_calls_paced_by_rate_limiter(self):
+        """Test every attempt takes a rate limit slot and a full bucket stops the call"""
+        with patch('utils.llm_processor.Config.LLM_REQUESTS_PER_MINUTE', 1), \
+             patch('utils.llm_processor.Config.REQUEST_TIMEOUT', 0):
+            client = GrokAPIClient("gsk_test")
+            reply = MagicMock()
+            reply.content = orjson.dumps({"choices": [{"message": {"content": "{}"}}], "usage": {}})
+            
+            with patch.object(client.session, 'post', return_value=reply) as post:
+                assert client.call([{"role": "user", "content": "x"}])[0] == "{}"
+                with pytest.raises(Exception, match="rate limit"):
+                    client.call([{"role": "user", "content": "y"}])
+        
+        assert post.call_count == 1
+    
+    def test_llm_rate_limiter_disabled_by_default(self):
+        """Test no limiter is created when LLM_REQUESTS_PER_MINUTE is 0"""
+        with patch('utils.llm_processor.Config.LLM_REQUESTS_PER_MINUTE', 0):
+            assert GrokAPIClient("gsk_test").rate_limiter is None
+    
+    @staticmethod
+    def _http_error_reply(status, headers=None):
+        """Build a reply whose raise_for_status raises like requests would"""
+        import requests
+        response = requests.Response()
+        response.status_code = status
+        response.headers.update(headers or {})
+        response._content = b'{"error": "nope"}'
+        return response
+    
+    def test_llm_rate_limit_honors_retry_after(self):
+        """Test a 429 waits for the API's Retry-After before retrying"""
+        client = GrokAPIClient("gsk_test")
+        reply = MagicMock()
+        reply.content = orjson.dumps({"choices": [{"message": {"content": "{}"}}], "usage": {}})
+        throttled = self._http_error_reply(429, {"Retry-After": "7"})
+        
+        with patch.object(client.session, 'post', side_effect=[throttled, reply]), \
+             patch('utils.llm_processor.time.sleep') as sleep:
+            assert client.call([{"role": "user", "content": "x"}]) == ("{}", 0, 0)
+        
+        sleep.assert_called_once_with(7.0)
+    
+    def test_llm_client_error_not_retried(self):
+        """Test a 4xx other than 408/429 fails without retrying"""
+        client = GrokAPIClient("gsk_test")
+        
+        with patch.object(client.session, 'post', return_value=self._http_error_reply(400)) as post, \
+             patch('utils.llm_processor.time.sleep') as sleep:
+            with pytest.raises(Exception, match="HTTP 400"):
+                client.call([{"role": "user", "content": "x"}])
+        
+        assert post.call_count == 1
+        sleep.assert_not_called()
+    
+    def test_llm_backoff_is_jittered_and_capped(self):
+        """Test retry delays vary between attempts' bounds and never exceed the cap"""
+        client = GrokAPIClient("gsk_test")
+        delays = [client._retry_delay(attempt) for attempt in range(10)]
+        
+        assert 1.0 <= delays[0] <= 2.0
+        assert all(delay <= client.max_retry_delay for delay in delays)
+
+
+# ============================================================================
+# TESTS: EXTRACTION CACHE
+# ============================================================================
+
+class TestExtractionCache:
+    """Tests for the OCR-keyed extraction cache"""
+    
+    def test_cache_hit_ignores_whitespace_and_case(self, sample_items):
+        """Test near-identical OCR text maps to the same entry"""
+        cache = ExtractionCache(maxsize=4)
+        cache.put("Medicine A  250.00\nMedicine B 300.00", "1", {"line_items": sample_items})
+        
+        cached = cache.get("medicine a 250.00 medicine b   300.00", "1")
+        assert cached is not None
+        assert cached["line_items"] == sample_items
+    
+    def test_cache_miss_on_other_page(self, sample_items):
+        """Test the page number is part of the key"""
+        cache = ExtractionCache(maxsize=4)
+        cache.put("Medicine A 250.00", "1", {"line_items": sample_items})
+        assert cache.get("Medicine A 250.00", "2") is None
+    
+    def test_cache_key_tied_to_prompt_version(self):
+        """Test a prompt change yields different keys for the same text"""
+        key = ExtractionCache.make_key("Medicine A 250.00", "1")
+        
+        with patch('utils.extraction_cache.PROMPT_VERSION', 'older-prompt'):
+            assert ExtractionCache.make_key("Medicine A 250.00", "1") != key
+        assert ExtractionCache.make_key("Medicine A 250.00", "1") == key
+    
+    def test_cache_key_tied_to_model(self, sample_items):
+        """Test entries stored for one model miss for another"""
+        cache = ExtractionCache(maxsize=4, model="model-a")
+        cache.put("Medicine A 250.00", "1", {"line_items": sample_items})
+        
+        cache.model = "model-b"
+        assert cache.get("Medicine A 250.00", "1") is None
+        cache.model = "model-a"
+        assert cache.get("Medicine A 250.00", "1") is not None
+    
+    def test_processor_cache_keyed_on_called_model(self):
+        """Test the shared cache names the model the Grok client actually sends"""
+        assert LLMProcessor.extraction_cache.model == LLMProcessor.get_api_client().model
+    
+    def test_redis_tier_shared_between_caches(self, sample_items):
+        """Test an extraction stored by one worker is found by another through Redis"""
+        class FakeRedis:
+            def __init__(self):
+                self.data, self.ttls = {}, {}
+            
+            def get(self, key):
+                return self.data.get(key)
+            
+            def setex(self, key, ttl, value):
+                self.data[key], self.ttls[key] = value, ttl
+        
+        redis_client = FakeRedis()
+        ExtractionCache(maxsize=4, redis_client=redis_client, redis_ttl=60).put(
+            "Medicine A 250.00", "1", {"line_items": sample_items}
+        )
+        other_worker = ExtractionCache(maxsize=4, redis_client=redis_client)
+        
+        assert list(redis_client.ttls.values()) == [60]
+        assert all(key.startswith("bxt:") for key in redis_client.data)
+        assert other_worker.get("Medicine A 250.00", "1")["line_items"] == sample_items
+        assert other_worker.get_stats()["size"] == 1
+    
+    def test_redis_errors_fall_back_to_local_cache(self, sample_items):
+        """Test an unavailable Redis neither breaks nor bypasses the local cache"""
+        redis_client = MagicMock()
+        redis_client.get.side_effect = ConnectionError("down")
+        redis_client.setex.side_effect = ConnectionError("down")
+        cache = ExtractionCache(maxsize=4, redis_client=redis_client)
+        
+        cache.put("Medicine A 250.00", "1", {"line_items": sample_items})
+        assert cache.get("Medicine A 250.00", "1")["line_items"] == sample_items
+        assert cache.get("Medicine B 300.00", "1") is None
+    
+    def test_redis_skipped_after_error_until_retry_window(self):
+        """Test one Redis failure skips Redis for REDIS_RETRY_AFTER seconds, then retries"""
+        redis_client = MagicMock()
+        redis_client.get.side_effect = ConnectionError("down")
+        cache = ExtractionCache(maxsize=4, redis_client=redis_client, redis_retry_after=30)
+        
+        with patch('utils.extraction_cache.time.monotonic', return_value=1000.0):
+            assert cache.get("Medicine A 250.00", "1") is None
+            assert cache.get("Medicine B 300.00", "1") is None
+            cache.put("Medicine B 300.00", "1", {"line_items": []})
+        assert redis_client.get.call_count == 1
+        redis_client.setex.assert_not_called()
+        
+        with patch('utils.extraction_cache.time.monotonic', return_value=1031.0):
+            cache.get("Medicine C 99.00", "1")
+        assert redis_client.get.call_count == 2
+    
+    def test_cache_evicts_least_recently_used(self):
+        """Test LRU eviction once maxsize is exceeded"""
+        cache = ExtractionCache(maxsize=2)
+        cache.put("a", "1", {"line_items": []})
+        cache.put("b", "1", {"line_items": []})
+        cache.get("a", "1")
+        cache.put("c", "1", {"line_items": []})
+        
+        assert cache.get("a", "1") is not None
+        assert cache.get("b", "1") is None
+    
+    @pytest.mark.usefixtures("clean_extraction_cache")
+    def test_llm_processor_skips_api_on_cache_hit(self):
+        """Test repeated OCR text is served without a second LLM call"""
+        processor = LLMProcessor()
+        llm_output = json.dumps({"line_items": [
+            {"item_name": "Medicine A", "item_amount": 250.0, "item_rate": 50.0, "item_quantity": 5.0}
+        ]})
+        
+        with patch.object(processor.api_client, 'call', return_value=(llm_output, 100, 20)) as call:
+            first, in_tok, _ = processor.extract_bill_items("Medicine A 5 50.00 250.00")
+            processor.reset_items()
+            second, cached_in_tok, cached_out_tok = processor.extract_bill_items("Medicine A 5 50.00 250.00")
+        
+        assert call.call_count == 1
+        assert in_tok == 100
+        assert (cached_in_tok, cached_out_tok) == (0, 0)
+        assert second["line_items"] == first["line_items"]
+
+
+# ============================================================================
+# TESTS: BATCHED EXTRACTION
+# ============================================================================
+
+def _combined_llm_output(*names):
+    """Build a combined-extraction LLM response with one item per document"""
+    return json.dumps({"documents": [
+        {"id": str(idx), "line_items": [
+            {"item_name": name, "item_amount": 10.0, "item_rate": 10.0, "item_quantity": 1.0}
+        ]}
+        for idx, name in enumerate(names)
+    ]})
+
+
+class TestBatchedExtraction:
+    """Tests for combining several documents into one LLM call"""
+    
+    @pytest.mark.usefixtures("clean_extraction_cache")
+    def test_combined_extraction_routes_items_per_document(self):
+        """Test each document gets its own items and a token share"""
+        processor = LLMProcessor()
+        
+        with patch.object(processor.api_client, 'call',
+                          return_value=(_combined_llm_output("Item A", "Item B"), 300, 60)) as call:
+            results = processor.extract_bill_items_combined(["doc one text", "doc two text"])
+        
+        assert call.call_count == 1
+        assert [r[0]["line_items"][0]["item_name"] for r in results] == ["Item A", "Item B"]
+        assert sum(r[1] for r in results) == 300
+    
+    @pytest.mark.usefixtures("clean_extraction_cache")
+    def test_batcher_coalesces_concurrent_submissions(self):
+        """Test concurrent submissions share a single LLM call"""
+        from concurrent.futures import ThreadPoolExecutor
+        batcher = ExtractionBatcher(max_batch=2, max_delay_ms=2000)
+        
+        with patch('utils.llm_processor.GrokAPIClient.call',
+                   return_value=(_combined_llm_output("Item A", "Item B"), 300, 60)) as call:
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                futures = [pool.submit(batcher.submit, text, True, 10) for text in ("first", "second")]
+                results = [f.result() for f in futures]
+        
+        assert call.call_count == 1
+        assert {r[0]["line_items"][0]["item_name"] for r in results} == {"Item A", "Item B"}
+    
+    def test_llm_processors_share_api_client(self):
+        """Test per-request processors reuse one API client"""
+        assert LLMProcessor().api_client is LLMProcessor().api_client
+
+
+# ============================================================================
+# TESTS: RESPONSE CACHE
+# ============================================================================
+
+class TestResponseCache:
+    """Tests for the per-URL response cache"""
+    
+    def test_cache_hit_zeroes_token_usage(self, sample_response):
+        """Test cached responses report no token spend"""
+        cache = ResponseCache(maxsize=4, ttl=60)
+        cache.put("https://example.com/bill.png", sample_response)
+        
+        cached = cache.get("https://example.com/bill.png")
+        assert cached["token_usage"]["total_tokens"] == 0
+        assert cached["data"] == sample_response["data"]
+        assert sample_response["token_usage"]["total_tokens"] == 1000
+    
+    def test_cache_entry_expires(self, sample_response):
+        """Test entries are dropped after their TTL"""
+        cache = ResponseCache(maxsize=4, ttl=0)
+        cache.put("https://example.com/bill.png", sample_response)
+        assert cache.get("https://example.com/bill.png") is None
+    
+    def test_endpoint_serves_cached_response(self, client, sample_response):
+        """Test the endpoint answers repeated URLs from the cache"""
+        from app import response_cache
+        url = "https://example.com/cached-bill.png"
+        response_cache.put(url, sample_response)
+        
+        with patch('app.ocr_extractor') as ocr:
+            response = client.post('/extract-bill-data', json={"document": url})
+            assert ocr.extract_pages_from_url.call_count == 0
+        
+        assert response.status_code == 200
+        assert response.headers["X-Cache"] == "HIT"
+        response_cache.clear()
+    
+    def test_endpoint_nocache_bypasses_cache(self, client, sample_response):
+        """Test ?nocache=1 reprocesses the document"""
+        from app import response_cache
+        url = "https://example.com/cached-bill.png"
+        response_cache.put(url, sample_response)
+        
+        with patch('app.ocr_extractor') as ocr:
+            ocr.extract_pages_from_url.return_value = [""]
+            response = client.post('/extract-bill-data?nocache=1', json={"document": url})
+            assert ocr.extract_pages_from_url.call_count == 1
+        
+        assert response.status_code == 422
+        response_cache.clear()
+
+
+# ============================================================================
+# TESTS: IN-FLIGHT DEDUPLICATION
+# ============================================================================
+
+class TestSingleFlight:
+    """Tests for sharing concurrent work on the same document"""
+    
+    def test_concurrent_callers_share_one_call(self):
+        """Test only the first caller runs the function"""
+        import threading
+        from concurrent.futures import Future
+        flight = SingleFlight()
+        started, release, waiting = threading.Event(), threading.Event(), threading.Event()
+        calls = []
+        future_result = Future.result
+        
+        def wait_on_leader(future, timeout=None):
+            waiting.set()
+            return future_result(future, timeout)
+        
+        def work():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return "result"
+        
+        results = []
+        leader = threading.Thread(target=lambda: results.append(flight.run("url", work)))
+        leader.start()
+        started.wait(5)
+        follower = threading.Thread(target=lambda: results.append(flight.run("url", work)))
+        with patch.object(Future, "result", wait_on_leader):
+            follower.start()
+            # Only a follower waits on the future, so the leader is released
+            # once the second caller has joined the in-flight call
+            assert waiting.wait(5)
+            release.set()
+            leader.join(5)
+            follower.join(5)
+        
+        assert len(calls) == 1
+        assert sorted(results, key=lambda r: r[1]) == [("result", False), ("result", True)]
+        assert flight.in_flight() == 0
+    
+    def test_errors_reach_every_caller_and_clear_key(self):
+        """Test a failed call is not remembered"""
+        flight = SingleFlight()
+        with pytest.raises(RuntimeError):
+            flight.run("url", lambda: (_ for _ in ()).throw(RuntimeError("boom")))
+        
+        assert flight.run("url", lambda: 42) == (42, True)
+    
+    def test_follower_gets_cached_copy_with_zero_tokens(self, sample_response):
+        """Test a request sharing another's extraction reports no token spend"""
+        import app as app_module
+        with patch.object(app_module.inflight_extractions, 'run',
+                          return_value=((sample_response, 200, "MISS"), False)):
+            response, status_code, cache_status = app_module._process_document(
+                "https://example.com/shared-bill.png"
+            )
+        
+        assert (status_code, cache_status) == (200, "HIT")
+        assert response["token_usage"]["total_tokens"] == 0
+        assert response["data"] == sample_response["data"]
+    
+    def test_new_leader_rechecks_cache_before_extracting(self, sample_response):
+        """Test a leader that starts just after the previous one cached its result reuses it"""
+        import app as app_module
+        with patch.object(app_module.response_cache, 'get', side_effect=[None, sample_response]), \
+             patch('app._extract_document') as extract:
+            response, status_code, cache_status = app_module._process_document(
+                "https://example.com/just-cached.png"
+            )
+        
+        extract.assert_not_called()
+        assert (status_code, cache_status) == (200, "HIT")
+        assert response is sample_response
+
+
+# ============================================================================
+# TESTS: RATE LIMITING
+# ============================================================================
+
+class TestRateLimiting:
+    """Tests for the token-bucket rate limiter"""
+    
+    def test_bucket_empties_and_refills(self):
+        """Test tokens run out after the burst and come back over time"""
+        bucket = TokenBucket(capacity=2, refill_rate=1000)
+        assert bucket.try_acquire()
+        assert bucket.try_acquire()
+        assert bucket.acquire(timeout=1)
+    
+    def test_bucket_without_refill_rejects(self):
+        """Test an exhausted bucket rejects and reports a wait"""
+        bucket = TokenBucket(capacity=1, refill_rate=0)
+        assert bucket.try_acquire()
+        assert not bucket.try_acquire()
+        assert not bucket.acquire(timeout=0)
+        assert bucket.retry_after() == float('inf')
+    
+    def test_endpoint_returns_429_with_retry_after(self, client):
+        """Test the endpoint sheds load when the bucket is empty"""
+        with patch('app.rate_limiter', TokenBucket(capacity=1, refill_rate=0.5)) as limiter:
+            limiter.try_acquire()
+            response = client.post(
+                '/extract-bill-data',
+                json={"document": "https://example.com/bill.png"}
+            )
+        
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "2"
+        assert response.get_json()["is_success"] is False
+    
+    def test_endpoint_returns_429_when_bucket_never_refills(self, client):
+        """Test a zero refill rate still sheds with 429 and a finite Retry-After"""
+        import app as app_module
+        with patch('app.rate_limiter', TokenBucket(capacity=1, refill_rate=0)) as limiter:
+            limiter.try_acquire()
+            response = client.post(
+                '/extract-bill-data',
+                json={"document": "https://example.com/bill.png"}
+            )
+        
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == str(app_module._MAX_RETRY_AFTER)
+    
+    def test_health_check_not_rate_limited(self, client):
+        """Test health checks bypass the limiter"""
+        with patch('app.rate_limiter', TokenBucket(capacity=1, refill_rate=0)) as limiter:
+            limiter.try_acquire()
+            response = client.get('/health')
+        
+        assert response.status_code == 200
+
+
+# ============================================================================
+# TESTS: BATCH ENDPOINT
+# ============================================================================
+
+class TestBatchEndpoint:
+    """Tests for the multi-document batch endpoint"""
+    
+    def test_batch_reports_per_document_results(self, client, sample_response):
+        """Test results keep input order and count successes and failures"""
+        with patch('app._process_document', return_value=(sample_response, 200, "MISS")) as process:
+            response = client.post('/extract-bill-data/batch', json={
+                "documents": ["https://example.com/a.png", "not-a-url", "https://example.com/b.png"]
+            })
+            assert process.call_count == 2
+        
+        assert response.status_code == 200
+        data = response.get_json()
+        assert [r["document"] for r in data["results"]] == [
+            "https://example.com/a.png", "not-a-url", "https://example.com/b.png"
+        ]
+        assert [r["status_code"] for r in data["results"]] == [200, 400, 200]
+        assert data["successful"] == 2
+        assert data["failed"] == 1
+        assert data["total_processed"] == 3
+    
+    def test_batch_rejects_empty_and_oversized(self, client):
+        """Test the documents list must be non-empty and bounded"""
+        response = client.post('/extract-bill-data/batch', json={"documents": []})
+        assert response.status_code == 400
+        
+        urls = [f"https://example.com/{i}.png" for i in range(65)]
+        response = client.post('/extract-bill-data/batch', json={"documents": urls})
+        assert response.status_code == 400
+    
+    def test_batch_stops_when_continue_on_error_disabled(self, client):
+        """Test documents after a failure are skipped when requested"""
+        failure = ({"is_success": False, "message": "boom"}, 500, None)
+        with patch('app.Config.BATCH_CONCURRENCY', 1), \
+             patch('app._process_document', return_value=failure):
+            response = client.post('/extract-bill-data/batch', json={
+                "documents": [f"https://example.com/{i}.png" for i in range(5)],
+                "continue_on_error": False
+            })
+        
+        data = response.get_json()
+        assert data["results"][0]["status_code"] == 500
+        assert data["results"][-1]["status_code"] == 424
+        assert data["successful"] == 0
+    
+    def test_batch_stops_at_invalid_url_when_continue_on_error_disabled(self, client, sample_response):
+        """Test an invalid URL stops the batch like any other failure"""
+        with patch('app._process_document', return_value=(sample_response, 200, "MISS")) as process:
+            response = client.post('/extract-bill-data/batch', json={
+                "documents": ["not-a-url", "https://example.com/good.png"],
+                "continue_on_error": False
+            })
+            assert process.call_count == 0
+        
+        data = response.get_json()
+        assert [r["status_code"] for r in data["results"]] == [400, 424]
+        assert data["successful"] == 0
+
+
+# ============================================================================
+# TESTS: JSON SERIALIZATION
+# ============================================================================
+
+class TestJSONSerialization:
+    """Tests for the orjson-backed Flask JSON provider"""
+    
+    def test_app_uses_orjson_provider(self):
+        """Test jsonify goes through the orjson provider"""
+        assert isinstance(app.json, OrjsonProvider)
+    
+    def test_compact_response_roundtrip(self, sample_response):
+        """Test compact responses parse back to the same payload"""
+        with app.app_context(), patch.object(app.json, 'compact', True):
+            body = app.json.response(sample_response).get_data()
+        
+        assert b"\n" not in body
+        assert json.loads(body) == sample_response
+    
+    def test_pretty_response_when_enabled(self, sample_response):
+        """Test pretty-printing can still be enabled outside production"""
+        with app.app_context(), patch.object(app.json, 'compact', False):
+            body = app.json.response(sample_response).get_data()
+        
+        assert b"\n" in body
+        assert json.loads(body) == sample_response
+
+
+# ============================================================================
+# TESTS: PROMPTS
+# ============================================================================
+
+class TestExtractionPrompts:
+    """Tests for extraction prompt construction"""
+    
+    def test_prompt_includes_page_and_text(self):
+        """Test the page number and OCR text are placed in the user message"""
+        messages = ExtractionPrompts.get_extraction_messages("Medicine A 5 50.00 250.00", "2")
+        
+        assert messages[-1]["content"] == "<text page=2>\nMedicine A 5 50.00 250.00\n</text>"
+    
+    def test_prompt_prefix_shared_across_requests(self):
+        """Test instructions are identical regardless of input"""
+        first = ExtractionPrompts.get_extraction_messages("Bill one", "1")
+        second = ExtractionPrompts.get_extraction_messages("Another bill {x}", "1")
+        
+        assert first[0] == second[0]
+        assert "<rules>" in first[0]["content"]
+    
+    def test_prompt_instructions_stay_compact(self):
+        """Test the fixed part of the prompt stays within its size budget"""
+        # ~4 characters per token, so this keeps the instructions near 200 tokens
+        assert len(ExtractionPrompts.get_extraction_messages("", "1")[0]["content"]) < 800
+    
+    def test_item_lists_sent_as_jsonl(self):
+        """Test item lists are embedded as one JSON object per line, not Python repr"""
+        items = [
+            {"item_name": "Medicine A", "item_amount": 250.0},
+            {"item_name": "Medicine B", "item_amount": 300.0}
+        ]
+        prompt = ExtractionPrompts.get_validation_prompt(items, "Medicine A 250.00")
+        
+        assert (
+            '<items>\n{"item_name":"Medicine A","item_amount":250.0}\n'
+            '{"item_name":"Medicine B","item_amount":300.0}\n</items>'
+        ) in prompt
+        assert "'item_name'" not in prompt
+    
+    def test_reconciliation_total_formatted_as_currency(self):
+        """Test the claimed total is rendered once with two decimals"""
+        prompt = ExtractionPrompts.get_reconciliation_prompt([], 1234.5678)
+        
+        assert "Claimed total: 1234.57\n" in prompt
+        assert '"claimed_total":1234.57,' in prompt
+        assert "1234.5678" not in prompt
+    
+    def test_prompts_are_plain_ascii(self):
+        """Test prompts carry no emoji or symbols that cost extra tokens"""
+        prompts = [
+            message["content"]
+            for messages in (
+                ExtractionPrompts.get_extraction_messages("", "1"),
+                ExtractionPrompts.get_batch_extraction_messages([("a", "")]),
+                ExtractionPrompts.get_multipage_extraction_messages([("1", "")]),
+            )
+            for message in messages
+        ] + [
+            ExtractionPrompts.get_validation_prompt([], ""),
+            ExtractionPrompts.get_reconciliation_prompt([], 0.0),
+            ExtractionPrompts.get_deduplication_check_prompt([], []),
+        ]
+        assert all(prompt.isascii() for prompt in prompts)
+    
+    def test_messages_share_constant_system_prompt(self):
+        """Test instructions go in an unchanging system message and the page in the user message"""
+        first = ExtractionPrompts.get_extraction_messages("Bill one", "1")
+        second = ExtractionPrompts.get_extraction_messages("Bill two", "3")
+        
+        assert first[0] == second[0]
+        assert first[0]["role"] == "system"
+        assert second[1] == {"role": "user", "content": "<text page=3>\nBill two\n</text>"}
+    
+    def test_combined_messages_share_constant_system_prompt(self):
+        """Test batch and multi-page instructions do not vary with the documents sent"""
+        one_doc = ExtractionPrompts.get_batch_extraction_messages([("0", "Bill one")])
+        two_docs = ExtractionPrompts.get_batch_extraction_messages([("0", "a"), ("1", "b")])
+        pages = ExtractionPrompts.get_multipage_extraction_messages([("1", "a")])
+        more_pages = ExtractionPrompts.get_multipage_extraction_messages([("1", "a"), ("2", "b")])
+        
+        assert one_doc[0] == two_docs[0]
+        assert pages[0] == more_pages[0]
+        assert two_docs[1] == {"role": "user", "content": '<doc id="0">\na\n</doc>\n\n<doc id="1">\nb\n</doc>'}
+        assert more_pages[1]["content"] == '<page n="1">\na\n</page>\n\n<page n="2">\nb\n</page>'
+
+
+# ============================================================================
+# TESTS: LONG PAGE CHUNKING
+# ============================================================================
+
+class TestLongPageChunking:
+    """Tests for splitting OCR text that exceeds MAX_OCR_CHARS"""
+    
+    def test_split_keeps_short_text_whole(self):
+        """Test text under the limit is not split"""
+        assert LLMProcessor._split_ocr_text("Medicine A 250.00", 100) == ["Medicine A 250.00"]
+    
+    def test_split_on_line_boundaries_with_overlap(self):
+        """Test chunks respect the limit, end on whole lines and overlap"""
+        text = "".join(f"Item {i} x 1 {i}.00\n" for i in range(100))
+        chunks = LLMProcessor._split_ocr_text(text, 300, overlap=50)
+        
+        assert len(chunks) > 1
+        assert all(len(chunk) <= 300 for chunk in chunks)
+        assert all(chunk.endswith("\n") for chunk in chunks)
+        assert chunks[0].splitlines(keepends=True)[-1] in chunks[1]
+        assert "Item 99 x 1 99.00" in chunks[-1]
+    
+    @pytest.mark.usefixtures("clean_extraction_cache")
+    def test_long_page_extracted_per_chunk_and_merged(self):
+        """Test each chunk gets its own LLM call and overlap duplicates are dropped"""
+        processor = LLMProcessor()
+        text = "".join(f"Item {i} x 1 {i}.00\n" for i in range(1, 40))
+        
+        def fake_call(messages, **kwargs):
+            prompt = messages[-1]["content"]
+            names = sorted({line.split(" x ")[0] for line in prompt.splitlines() if line.startswith("Item ")})
+            items = [
+                {"item_name": name, "item_quantity": 1.0,
+                 "item_rate": float(name.split()[1]), "item_amount": float(name.split()[1])}
+                for name in names
+            ]
+            return json.dumps({"line_items": items}), 100, 10
+        
+        with patch('utils.llm_processor.Config.MAX_OCR_CHARS', 300), \
+             patch.object(processor.api_client, 'call', side_effect=fake_call) as call:
+            result, input_tok, output_tok = processor.extract_bill_items(text, use_cache=False)
+        
+        assert call.call_count > 1
+        assert input_tok == 100 * call.call_count
+        assert len(result["line_items"]) == 39
+        assert result["validation"]["duplicate_items"] > 0
+
+
+# ============================================================================
+# TESTS: MALFORMED REPLIES
+# ============================================================================
+
+class TestMalformedReplies:
+    """Tests for re-asking the model when its reply is not the requested JSON"""
+    
+    @pytest.mark.usefixtures("clean_extraction_cache")
+    def test_malformed_reply_sent_back_with_problem(self):
+        """Test a garbled reply is returned to the model and the corrected reply used"""
+        processor = LLMProcessor()
+        good = orjson.dumps({"line_items": [{"item_name": "Syringe", "item_amount": 20.0,
+                                             "item_rate": 10.0, "item_quantity": 2.0}]}).decode()
+        
+        with patch('utils.llm_processor.Config.LLM_FORMAT_RETRIES', 1), \
+             patch.object(processor.api_client, 'call',
+                          side_effect=[("Sorry, here are the items", 100, 10), (good, 120, 30)]) as call:
+            result, input_tok, output_tok = processor.extract_bill_items("Syringe 2 x 10.00", use_cache=False)
+        
+        retry_messages = call.call_args_list[1].args[0]
+        assert retry_messages[-2] == {"role": "assistant", "content": "Sorry, here are the items"}
+        assert "not valid JSON" in retry_messages[-1]["content"]
+        assert [item["item_name"] for item in result["line_items"]] == ["Syringe"]
+        assert (input_tok, output_tok) == (220, 40)
+    
+    @pytest.mark.usefixtures("clean_extraction_cache")
+    def test_usable_reply_not_retried(self):
+        """Test a reply with a line_items list, even an empty one, is accepted as is"""
+        processor = LLMProcessor()
+        
+        with patch('utils.llm_processor.Config.LLM_FORMAT_RETRIES', 1), \
+             patch.object(processor.api_client, 'call', return_value=('{"line_items": []}', 50, 5)) as call:
+            processor.extract_bill_items("No items here", use_cache=False)
+        
+        assert call.call_count == 1
+    
+    def test_reply_format_problem(self):
+        """Test the shape check names what is wrong"""
+        assert LLMProcessor._reply_format_problem({"line_items": []}) is None
+        assert LLMProcessor._reply_format_problem({}) is not None
+        assert LLMProcessor._reply_format_problem([{"item_name": "x"}]) == "it was not a JSON object"
+        assert LLMProcessor._reply_format_problem({"line_items": "none"}) == '"line_items" must be a list'
+
+
+# ============================================================================
+# TESTS: CONFIGURATION
+# ============================================================================
+
+class TestConfiguration:
+    """Tests for configuration loading"""
+    
+    def test_config_summary_is_cached_and_read_only(self):
+        """Test the summary is built once and cannot be mutated"""
+        summary = Config.get_config_summary()
+        
+        assert Config.get_config_summary() is summary
+        assert "api_key_set" in summary
+        with pytest.raises(TypeError):
+            summary["debug"] = True
+    
+    def test_get_config_reuses_instance_per_environment(self):
+        """Test environment names are case-insensitive and cached"""
+        assert get_config("production") is get_config("PRODUCTION")
+        assert get_config("production").DEBUG is False
 
 
 # ============================================================================
@@ -505,14 +1469,14 @@ class TestAPIEndpoints:
         """Test health check endpoint"""
         response = client.get('/health')
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = orjson.loads(response.data)
         assert data["status"] == "healthy"
     
     def test_home_endpoint(self, client):
         """Test home endpoint"""
         response = client.get('/')
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = orjson.loads(response.data)
         assert "endpoints" in data
     
     def test_extract_bill_data_missing_document(self, client):
@@ -523,7 +1487,7 @@ class TestAPIEndpoints:
             content_type='application/json'
         )
         assert response.status_code == 400
-        data = json.loads(response.data)
+        data = orjson.loads(response.data)
         assert data["is_success"] is False
     
     def test_extract_bill_data_invalid_json(self, client):
@@ -548,7 +1512,7 @@ class TestAPIEndpoints:
         """Test 404 error handling"""
         response = client.get('/nonexistent')
         assert response.status_code == 404
-        data = json.loads(response.data)
+        data = orjson.loads(response.data)
         assert data["is_success"] is False
     
     def test_method_not_allowed(self, client):
@@ -6,6 +6,9 @@ Also requires: poppler (https://github.com/oschwartz10612/poppler-windows/releas
 """
 
 import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 from pdf2image import convert_from_path
 import logging
@@ -26,15 +29,27 @@ def convert_pdf_to_images(pdf_path, output_dir, dpi=300):
     try:
         logger.info(f"Converting {pdf_path.name}...")
         
-        # Convert PDF to images
-        images = convert_from_path(pdf_path, dpi=dpi)
-        
         output_files = []
-        for i, image in enumerate(images, 1):
-            output_file = output_dir / f"{pdf_path.stem}_page_{i}.png"
-            image.save(output_file, 'PNG')
-            output_files.append(output_file)
-            logger.info(f"  ✅ Saved page {i} to {output_file.name}")
+        # Let poppler write PNGs straight to disk instead of decoding to PIL
+        # and re-encoding. Pages land in a scratch dir first so stale files
+        # from earlier runs can't be picked up, then get their final names.
+        # One poppler thread; batch_convert_pdfs already runs one process per core.
+        with tempfile.TemporaryDirectory(dir=output_dir) as scratch_dir:
+            page_paths = convert_from_path(
+                pdf_path,
+                dpi=dpi,
+                output_folder=scratch_dir,
+                fmt='png',
+                paths_only=True,
+                use_pdftocairo=True,
+                thread_count=1
+            )
+            
+            for i, page_path in enumerate(page_paths, 1):
+                output_file = output_dir / f"{pdf_path.stem}_page_{i}.png"
+                os.replace(page_path, output_file)
+                output_files.append(output_file)
+                logger.info(f"  ✅ Saved page {i} to {output_file.name}")
         
         return output_files
         
@@ -66,10 +81,13 @@ def batch_convert_pdfs(input_dir, output_dir):
     logger.info(f"Output directory: {output_path}")
     logger.info("="*70)
     
-    total_pages = 0
-    for pdf_file in pdf_files:
-        output_files = convert_pdf_to_images(pdf_file, output_path)
-        total_pages += len(output_files)
+    # Rasterization is CPU-bound and independent per file, so fan out
+    # across processes instead of converting one PDF at a time
+    convert = partial(convert_pdf_to_images, output_dir=output_path)
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        results = list(executor.map(convert, pdf_files))
+    
+    total_pages = sum(len(output_files) for output_files in results)
     
     logger.info("="*70)
     logger.info(f"✅ Conversion complete!")
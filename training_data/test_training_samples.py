@@ -3,9 +3,12 @@ Test script to process all training samples and analyze accuracy
 """
 
 import os
-import json
+import threading
 import time
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 import logging
@@ -13,15 +16,53 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Maximum API calls started per second (override with TRAINING_TEST_RPS)
+DEFAULT_RPS = 0.5
+
+
+class RateLimiter:
+    """Spaces calls to at most `rps` per second, sleeping only when ahead of schedule"""
+    
+    def __init__(self, rps):
+        self.interval = 1.0 / rps if rps > 0 else 0.0
+        self._next_slot = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def wait(self):
+        """Block until the next call slot is due"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next_slot, now)
+            self._next_slot = slot + self.interval
+        
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
 
 class TrainingSampleTester:
     """Test all training samples and generate accuracy report"""
     
-    def __init__(self, api_base_url="http://localhost:3000", samples_dir="training_data/TRAINING_SAMPLES"):
+    def __init__(self, api_base_url="http://localhost:3000", samples_dir="training_data/TRAINING_SAMPLES", max_workers=8, rps=None):
         self.api_base_url = api_base_url
         self.samples_dir = Path(samples_dir)
         self.results_dir = Path("training_data/test_results")
         self.results_dir.mkdir(parents=True, exist_ok=True)
+        self.max_workers = max_workers
+        
+        # Start calls no faster than the API's rate limit allows
+        if rps is None:
+            rps = float(os.getenv("TRAINING_TEST_RPS", DEFAULT_RPS))
+        self.rate_limiter = RateLimiter(rps)
+        
+        # Shared by the worker threads so API calls reuse keep-alive connections
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        
+        # Guards results/summary, which worker threads update concurrently
+        self._lock = threading.Lock()
         
         self.results = []
         self.summary = {
@@ -77,9 +118,10 @@ class TrainingSampleTester:
                     "pagewise_items": response["data"]["pagewise_line_items"]
                 }
                 
-                self.summary["successful"] += 1
-                self.summary["total_items_extracted"] += result["items_extracted"]
-                self.summary["total_tokens_used"] += response["token_usage"]["total_tokens"]
+                with self._lock:
+                    self.summary["successful"] += 1
+                    self.summary["total_items_extracted"] += result["items_extracted"]
+                    self.summary["total_tokens_used"] += response["token_usage"]["total_tokens"]
                 
                 logger.info(f"✅ SUCCESS - Extracted {result['items_extracted']} items in {processing_time:.2f}s")
             else:
@@ -90,11 +132,13 @@ class TrainingSampleTester:
                     "error": response.get("message", "Unknown error")
                 }
                 
-                self.summary["failed"] += 1
+                with self._lock:
+                    self.summary["failed"] += 1
                 logger.error(f"❌ FAILED - {result['error']}")
             
-            self.results.append(result)
-            self.summary["documents"].append(result)
+            with self._lock:
+                self.results.append(result)
+                self.summary["documents"].append(result)
             
             return result
             
@@ -105,8 +149,9 @@ class TrainingSampleTester:
                 "status": "error",
                 "error": str(e)
             }
-            self.results.append(result)
-            self.summary["failed"] += 1
+            with self._lock:
+                self.results.append(result)
+                self.summary["failed"] += 1
             return result
     
     def _call_api_with_local_file(self, file_path):
@@ -121,7 +166,9 @@ class TrainingSampleTester:
         # Or upload the file to a temporary hosting service
         
         # Placeholder implementation:
-        # In real scenario, you'd upload file to cloud storage and get URL
+        # In real scenario, you'd upload file to cloud storage and get URL,
+        # then call the API with self.session.post(...) (not requests.post)
+        # so concurrent calls share pooled connections
         
         logger.warning("⚠️  Local file testing requires modification to handle file uploads")
         logger.info("💡 Recommended: Upload training samples to cloud storage and use URLs")
@@ -152,13 +199,17 @@ class TrainingSampleTester:
         
         self.summary["total_documents"] = len(all_files)
         
-        # Process each file
-        for i, file_path in enumerate(all_files, 1):
-            logger.info(f"\n[{i}/{len(all_files)}] Processing {file_path.name}...")
-            self.process_document(file_path)
+        # Process files on a thread pool; calls are network-bound, so they
+        # overlap while each one waits on the API
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = []
+            for i, file_path in enumerate(all_files, 1):
+                self.rate_limiter.wait()
+                logger.info(f"\n[{i}/{len(all_files)}] Processing {file_path.name}...")
+                futures.append(executor.submit(self.process_document, file_path))
             
-            # Add delay to avoid rate limiting
-            time.sleep(2)
+            for future in futures:
+                future.result()
         
         # Calculate averages
         if self.summary["successful"] > 0:
@@ -174,8 +225,7 @@ class TrainingSampleTester:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         results_file = self.results_dir / f"test_results_{timestamp}.json"
         
-        with open(results_file, 'w') as f:
-            json.dump(self.summary, f, indent=2)
+        results_file.write_bytes(orjson.dumps(self.summary, option=orjson.OPT_INDENT_2))
         
         logger.info(f"\n💾 Results saved to: {results_file}")
     
@@ -4,8 +4,13 @@ You need to upload training images to cloud storage first and add URLs here
 """
 
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import orjson
+import os
 import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 import logging
 
@@ -13,12 +18,37 @@ logging.basicConfig(level=logging.INFO, format='%(message)s')
 logger = logging.getLogger(__name__)
 
 
+@dataclass(slots=True)
+class DocumentResult:
+    """Outcome of testing one document (orjson serializes it directly)"""
+    document: str
+    status: str
+    items: int = 0
+    tokens: int = 0
+    time: float = 0.0
+    error: str = ""
+
+
 class APITester:
     """Test API with sample URLs"""
     
     def __init__(self, api_url="http://localhost:3000"):
         self.api_url = api_url
         self.results = []
+        
+        # One keep-alive session for every call; retry briefly when the API
+        # sheds load (429) or a proxy in front of it hiccups (502/503)
+        retry = Retry(
+            total=3,
+            backoff_factor=1,
+            status_forcelist=[429, 502, 503],
+            allowed_methods=frozenset(["GET", "POST"]),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
     
     def test_document(self, document_url, document_name=""):
         """Test a single document"""
@@ -30,7 +60,7 @@ class APITester:
         
         try:
             # Make API request
-            response = requests.post(
+            response = self.session.post(
                 f"{self.api_url}/extract-bill-data",
                 json={"document": document_url},
                 timeout=120
@@ -39,7 +69,7 @@ class APITester:
             processing_time = time.time() - start_time
             
             # Parse response
-            result = response.json()
+            result = orjson.loads(response.content)
             
             if response.status_code == 200 and result.get("is_success"):
                 logger.info(f"✅ SUCCESS (HTTP {response.status_code})")
@@ -47,31 +77,35 @@ class APITester:
                 logger.info(f"📦 Items Extracted: {result['data']['total_item_count']}")
                 logger.info(f"🎫 Tokens Used: {result['token_usage']['total_tokens']}")
                 
-                # Show extracted items
-                logger.info(f"\n📋 Extracted Items:")
-                for page in result['data']['pagewise_line_items']:
-                    logger.info(f"  Page {page['page_no']} ({page['page_type']}):")
-                    for item in page['bill_items']:
-                        logger.info(f"    • {item['item_name']}: ₹{item['item_amount']} "
-                                  f"({item['item_quantity']} × ₹{item['item_rate']})")
+                # Show extracted items as one log record rather than one per item
+                if logger.isEnabledFor(logging.INFO):
+                    lines = ["\n📋 Extracted Items:"]
+                    for page in result['data']['pagewise_line_items']:
+                        lines.append(f"  Page {page['page_no']} ({page['page_type']}):")
+                        lines.extend(
+                            f"    • {item['item_name']}: ₹{item['item_amount']} "
+                            f"({item['item_quantity']} × ₹{item['item_rate']})"
+                            for item in page['bill_items']
+                        )
+                    logger.info("\n".join(lines))
                 
-                self.results.append({
-                    "document": document_name or document_url,
-                    "status": "success",
-                    "items": result['data']['total_item_count'],
-                    "tokens": result['token_usage']['total_tokens'],
-                    "time": processing_time
-                })
+                self.results.append(DocumentResult(
+                    document=document_name or document_url,
+                    status="success",
+                    items=result['data']['total_item_count'],
+                    tokens=result['token_usage']['total_tokens'],
+                    time=processing_time
+                ))
                 
             else:
                 logger.error(f"❌ FAILED (HTTP {response.status_code})")
                 logger.error(f"Error: {result.get('message', 'Unknown error')}")
                 
-                self.results.append({
-                    "document": document_name or document_url,
-                    "status": "failed",
-                    "error": result.get('message', 'Unknown error')
-                })
+                self.results.append(DocumentResult(
+                    document=document_name or document_url,
+                    status="failed",
+                    error=result.get('message', 'Unknown error')
+                ))
             
             return result
             
@@ -89,17 +123,27 @@ class APITester:
         logger.info("📊 TEST SUMMARY")
         logger.info(f"{'='*70}")
         
-        successful = len([r for r in self.results if r['status'] == 'success'])
-        failed = len([r for r in self.results if r['status'] == 'failed'])
+        # One pass over the results for the counts and the success totals
+        successful = failed = 0
+        total_items = total_tokens = 0
+        total_time = 0.0
+        for r in self.results:
+            if r.status == 'success':
+                successful += 1
+                total_items += r.items
+                total_tokens += r.tokens
+                total_time += r.time
+            elif r.status == 'failed':
+                failed += 1
         
         logger.info(f"Total Tests: {len(self.results)}")
         logger.info(f"✅ Passed: {successful}")
         logger.info(f"❌ Failed: {failed}")
         
         if successful > 0:
-            avg_items = sum(r.get('items', 0) for r in self.results if r['status'] == 'success') / successful
-            avg_tokens = sum(r.get('tokens', 0) for r in self.results if r['status'] == 'success') / successful
-            avg_time = sum(r.get('time', 0) for r in self.results if r['status'] == 'success') / successful
+            avg_items = total_items / successful
+            avg_tokens = total_tokens / successful
+            avg_time = total_time / successful
             
             logger.info(f"\n📈 Averages:")
             logger.info(f"  Items per document: {avg_items:.1f}")
@@ -120,6 +164,9 @@ def main():
     # Your API URL (change to deployed URL for production testing)
     API_URL = "http://localhost:3000"
     
+    # Documents tested at the same time (the API answers 429 when overloaded)
+    MAX_CONCURRENT = 8
+    
     # Test URLs - Add your uploaded training sample URLs here
     test_cases = [
         # {
@@ -337,7 +384,7 @@ def main():
     # Test health endpoint first
     logger.info("🔍 Testing health endpoint...")
     try:
-        response = requests.get(f"{API_URL}/health", timeout=10)
+        response = tester.session.get(f"{API_URL}/health", timeout=10)
         if response.status_code == 200:
             logger.info("✅ API is healthy and ready")
         else:
@@ -350,13 +397,13 @@ def main():
     # Run tests
     logger.info(f"\n🚀 Starting tests with {len(test_cases)} documents...")
     
-    for i, test_case in enumerate(test_cases, 1):
-        logger.info(f"\n[{i}/{len(test_cases)}]")
-        tester.test_document(test_case['url'], test_case['name'])
-        
-        # Add delay between requests
-        if i < len(test_cases):
-            time.sleep(2)
+    # Requests are network-bound, so run them on a thread pool and let
+    # their latencies overlap instead of waiting for each in turn
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT) as executor:
+        list(executor.map(
+            lambda test_case: tester.test_document(test_case['url'], test_case['name']),
+            test_cases
+        ))
     
     # Print summary
     tester.print_summary()
@@ -365,11 +412,10 @@ def main():
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     results_file = f"training_data/test_results/api_test_{timestamp}.json"
     
-    import os
     os.makedirs("training_data/test_results", exist_ok=True)
     
-    with open(results_file, 'w') as f:
-        json.dump(tester.results, f, indent=2)
+    with open(results_file, 'wb') as f:
+        f.write(orjson.dumps(tester.results, option=orjson.OPT_INDENT_2))
     
     logger.info(f"\n💾 Results saved to: {results_file}")
 
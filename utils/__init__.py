@@ -7,10 +7,24 @@ from .ocr_extractor import OCRExtractor
 from .llm_processor import LLMProcessor
 from .response_formatter import ResponseFormatter
 from .validators import BillValidator
+from .extraction_cache import ExtractionCache
+from .response_cache import ResponseCache
+from .batcher import ExtractionBatcher
+from .rate_limit import TokenBucket
+from .json_provider import OrjsonProvider
+from .http_session import create_session
+from .single_flight import SingleFlight
 
 __all__ = [
     'OCRExtractor',
     'LLMProcessor',
     'ResponseFormatter',
-    'BillValidator'
+    'BillValidator',
+    'ExtractionCache',
+    'ResponseCache',
+    'ExtractionBatcher',
+    'TokenBucket',
+    'OrjsonProvider',
+    'create_session',
+    'SingleFlight'
 ]
@@ -0,0 +1,131 @@
+"""
+Extraction Batcher - Coalesces concurrent extraction requests
+Collects OCR texts arriving within a short window and extracts them
+with a single LLM call, then hands each request its own result
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Tuple, Any, List, Optional
+
+from utils.llm_processor import LLMProcessor
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractionBatcher:
+    """
+    Micro-batches single-page extractions across concurrent requests
+    """
+    
+    def __init__(self, max_batch: int = 8, max_delay_ms: int = 30, max_workers: int = 4):
+        """
+        Initialize batcher
+        
+        Args:
+            max_batch: Maximum documents per LLM call
+            max_delay_ms: How long the first document waits for others to join
+            max_workers: Maximum batches in flight at once
+        """
+        self.max_batch = max_batch
+        self.max_delay = max_delay_ms / 1000
+        self.max_workers = max_workers
+        
+        self._queue: "queue.Queue[Tuple[str, bool, Future]]" = queue.Queue()
+        self._executor = None
+        self._collector = None
+        self._start_lock = threading.Lock()
+    
+    def submit(self, ocr_text: str, use_cache: bool = True,
+               timeout: Optional[float] = None) -> Tuple[Dict[str, Any], int, int]:
+        """
+        Queue a document for extraction and wait for its result
+        
+        Args:
+            ocr_text: OCR text of a single-page document
+            use_cache: Serve from the extraction cache when possible
+            timeout: Seconds to wait for the result
+        
+        Returns:
+            Tuple of (extracted_data_dict, input_tokens, output_tokens)
+        """
+        self._ensure_started()
+        
+        future: Future = Future()
+        self._queue.put((ocr_text, use_cache, future))
+        return future.result(timeout=timeout)
+    
+    def _ensure_started(self) -> None:
+        """Start the collector thread on first use (after any worker fork)"""
+        if self._collector is not None:
+            return
+        
+        with self._start_lock:
+            if self._collector is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="extraction-batch"
+                )
+                self._collector = threading.Thread(
+                    target=self._collect,
+                    name="extraction-batcher",
+                    daemon=True
+                )
+                self._collector.start()
+                logger.info(
+                    "✅ Extraction batcher started (max_batch=%s, "
+                    "max_delay=%.0fms)",
+                    self.max_batch, self.max_delay * 1000
+                )
+    
+    def _collect(self) -> None:
+        """Group queued documents into batches and dispatch them"""
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_delay
+            
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            for use_cache in (True, False):
+                group = [entry for entry in batch if entry[1] is use_cache]
+                if group:
+                    self._executor.submit(self._dispatch, group, use_cache)
+    
+    def _dispatch(self, group: List[Tuple[str, bool, Future]], use_cache: bool) -> None:
+        """
+        Run one combined extraction and resolve the waiting futures
+        
+        Args:
+            group: Queued (ocr_text, use_cache, future) entries
+            use_cache: Cache flag shared by the group
+        """
+        logger.debug("📦 Dispatching extraction batch of %s", len(group))
+        
+        try:
+            processor = LLMProcessor()
+            if len(group) == 1:
+                results = [processor.extract_bill_items(group[0][0], "1", use_cache=use_cache)]
+            else:
+                results = processor.extract_bill_items_combined(
+                    [ocr_text for ocr_text, _, _ in group],
+                    use_cache=use_cache
+                )
+            
+            for (_, _, future), result in zip(group, results):
+                future.set_result(result)
+        
+        except Exception as e:
+            logger.error("❌ Extraction batch failed: %s", e)
+            for _, _, future in group:
+                if not future.done():
+                    future.set_exception(e)
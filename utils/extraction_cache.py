@@ -0,0 +1,277 @@
+"""
+Extraction Cache - Reuses LLM extraction results for repeated documents
+Keys on a digest of normalized OCR text so re-uploads skip the LLM call
+Optionally backed by Redis so every worker and restart shares the results
+"""
+
+import copy
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Any, Optional
+
+import orjson
+from prompts.extraction_prompts import PROMPT_VERSION
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=8)
+def _key_prefix(model: str, prompt_version: str) -> "hashlib.blake2b":
+    """
+    Hash the parts of a key that decide what the LLM would answer
+    
+    Args:
+        model: LLM model name
+        prompt_version: Fingerprint of the extraction prompts
+    
+    Returns:
+        BLAKE2b state to copy and extend with each page's text (never
+        update it in place: it is cached per model and prompt version)
+    """
+    prefix = hashlib.blake2b(digest_size=16)
+    for part in (model, prompt_version):
+        prefix.update(part.encode())
+        prefix.update(b'\0')
+    return prefix
+
+
+# Namespace for extraction entries in a shared Redis
+_REDIS_KEY_PREFIX = "bxt:"
+
+# OCR output for the same document varies in spacing and letter case
+# between runs, so both are normalized away before hashing
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+class ExtractionCache:
+    """
+    Thread-safe LRU cache of extraction results keyed by OCR text
+    """
+    
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        redis_client: Any = None,
+        redis_ttl: int = 86400,
+        redis_retry_after: float = 30.0,
+        model: str = ""
+    ):
+        """
+        Initialize extraction cache
+        
+        Args:
+            maxsize: Maximum number of cached extractions
+            redis_client: Optional Redis client used as a shared second tier
+            redis_ttl: Seconds an extraction is kept in Redis
+            redis_retry_after: Seconds Redis is skipped after an error
+            model: LLM model that produces the cached extractions
+        """
+        self.maxsize = maxsize
+        self.redis_client = redis_client
+        self.redis_ttl = redis_ttl
+        self.redis_retry_after = redis_retry_after
+        self.model = model
+        self._redis_skip_until = 0.0
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def make_key(ocr_text: str, page_number: str = "1", model: str = "") -> str:
+        """
+        Build cache key from OCR text
+        
+        Args:
+            ocr_text: OCR-extracted text from bill
+            page_number: Page number the text belongs to
+            model: LLM model that produces the extraction
+        
+        Returns:
+            BLAKE2b hex digest of the model, prompt version and normalized text
+        """
+        normalized = _WHITESPACE_RE.sub(' ', ocr_text).strip().casefold()
+        # Every key starts with the model and the prompt version, so
+        # switching either never serves the other's results
+        digest = _key_prefix(model, PROMPT_VERSION).copy()
+        digest.update(str(page_number).encode())
+        digest.update(b'\0')
+        digest.update(normalized.encode())
+        return digest.hexdigest()
+    
+    def get(self, ocr_text: str, page_number: str = "1") -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached extraction
+        
+        Args:
+            ocr_text: OCR-extracted text from bill
+            page_number: Page number the text belongs to
+        
+        Returns:
+            Copy of the cached extraction, or None on miss
+        """
+        if self.maxsize <= 0:
+            return None
+        
+        key = self.make_key(ocr_text, page_number, self.model)
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        
+        if entry is None:
+            entry = self._redis_get(key)
+            if entry is None:
+                with self._lock:
+                    self.misses += 1
+                return None
+            
+            # Keep a local copy so the next lookup skips the network
+            self._store(key, entry)
+            with self._lock:
+                self.hits += 1
+        
+        logger.debug("🎯 Extraction cache hit: %.12s", key)
+        return copy.deepcopy(entry)
+    
+    def put(self, ocr_text: str, page_number: str, extracted_data: Dict[str, Any]) -> None:
+        """
+        Store an extraction result
+        
+        Args:
+            ocr_text: OCR-extracted text from bill
+            page_number: Page number the text belongs to
+            extracted_data: Extraction result to cache
+        """
+        if self.maxsize <= 0:
+            return
+        
+        key = self.make_key(ocr_text, page_number, self.model)
+        self._store(key, copy.deepcopy(extracted_data))
+        self._redis_put(key, extracted_data)
+    
+    def _store(self, key: str, entry: Dict[str, Any]) -> None:
+        """
+        Insert an entry into the local LRU, evicting the oldest if full
+        
+        Args:
+            key: Cache key
+            entry: Extraction result owned by the cache
+        """
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def _redis_get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up an extraction in Redis (errors count as a miss)
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            Extraction result, or None if absent or Redis is unavailable
+        """
+        if not self._redis_available():
+            return None
+        
+        try:
+            payload = self.redis_client.get(_REDIS_KEY_PREFIX + key)
+            return orjson.loads(payload) if payload is not None else None
+        except Exception as e:
+            self._redis_failed("read", e)
+            return None
+    
+    def _redis_put(self, key: str, extracted_data: Dict[str, Any]) -> None:
+        """
+        Store an extraction in Redis (errors are logged and ignored)
+        
+        Args:
+            key: Cache key
+            extracted_data: Extraction result to store
+        """
+        if not self._redis_available():
+            return
+        
+        try:
+            self.redis_client.setex(_REDIS_KEY_PREFIX + key, self.redis_ttl, orjson.dumps(extracted_data))
+        except Exception as e:
+            self._redis_failed("write", e)
+    
+    def _redis_available(self) -> bool:
+        """
+        Check whether Redis is configured and not being skipped after an error
+        
+        Returns:
+            True if the Redis tier should be tried
+        """
+        return self.redis_client is not None and time.monotonic() >= self._redis_skip_until
+    
+    def _redis_failed(self, operation: str, error: Exception) -> None:
+        """
+        Skip Redis for a while so an outage does not add a timeout to every lookup
+        
+        Args:
+            operation: "read" or "write"
+            error: Exception raised by the Redis client
+        """
+        self._redis_skip_until = time.monotonic() + self.redis_retry_after
+        logger.warning(
+            "⚠️ Redis extraction cache %s failed, skipping Redis for %.0fs: %s",
+            operation, self.redis_retry_after, error
+        )
+    
+    def clear(self) -> None:
+        """Remove all cached extractions and reset statistics"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get cache statistics
+        
+        Returns:
+            Dictionary with size, hit and miss counts
+        """
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+
+def create_redis_client(url: str) -> Any:
+    """
+    Create a Redis client for the shared extraction cache
+    
+    Args:
+        url: Redis URL (e.g. redis://localhost:6379/0), empty to disable
+    
+    Returns:
+        Redis client, or None if disabled or the redis package is missing
+    """
+    if not url:
+        return None
+    
+    try:
+        import redis
+    except ImportError:
+        logger.warning("⚠️ REDIS_URL is set but the redis package is not installed; using in-process cache only")
+        return None
+    
+    # Connections are opened lazily, after gunicorn forks the workers
+    return redis.Redis.from_url(url, socket_timeout=1.0, socket_connect_timeout=1.0)
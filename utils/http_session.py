@@ -0,0 +1,24 @@
+"""
+HTTP Session - Pooled connections for upstream calls
+Reusing a session keeps TCP/TLS connections alive between requests
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+def create_session(pool_size: int) -> requests.Session:
+    """
+    Create a requests session with a connection pool sized for concurrent use
+    
+    Args:
+        pool_size: Maximum connections kept open per host
+    
+    Returns:
+        Configured requests.Session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
@@ -0,0 +1,81 @@
+"""
+JSON Provider - orjson-backed serialization for Flask
+Makes jsonify() and request.get_json() use orjson instead of stdlib json
+"""
+
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from flask.json.provider import JSONProvider
+
+
+def _default(obj: Any) -> Any:
+    """
+    Serialize types orjson does not handle natively
+    
+    Args:
+        obj: Object orjson could not serialize
+    
+    Returns:
+        JSON-serializable replacement
+    """
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if hasattr(obj, "__html__"):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class OrjsonProvider(JSONProvider):
+    """
+    Flask JSON provider using orjson (compact output unless pretty-printing is enabled)
+    """
+    
+    sort_keys: bool = False
+    compact: bool = True
+    mimetype: str = "application/json"
+    
+    def _options(self, pretty: bool = False) -> int:
+        """Build orjson option flags for the current settings"""
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return option
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """
+        Serialize data as a JSON string
+        
+        Args:
+            obj: Data to serialize
+        
+        Returns:
+            JSON string
+        """
+        return orjson.dumps(obj, default=_default, option=self._options()).decode()
+    
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        """
+        Deserialize data from a JSON string or bytes
+        
+        Args:
+            s: JSON text
+        
+        Returns:
+            Parsed data
+        """
+        return orjson.loads(s)
+    
+    def response(self, *args: Any, **kwargs: Any):
+        """
+        Build a JSON response without an intermediate str round-trip
+        
+        Returns:
+            Flask response with application/json mimetype
+        """
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=_default, option=self._options(pretty=not self.compact))
+        return self._app.response_class(body, mimetype=self.mimetype)
@@ -9,14 +9,36 @@ Handles bill line item extraction using Grok API with advanced features:
 
 import json
 import logging
+import random
+import re
+import threading
 import time
-from typing import Dict, Tuple, Any, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Tuple, Any, List, Optional
+import orjson
 import requests
 from config import Config
 from prompts.extraction_prompts import ExtractionPrompts
+from utils.extraction_cache import ExtractionCache, create_redis_client
+from utils.http_session import create_session
+from utils.rate_limit import TokenBucket
+from utils.validators import BillValidator
 
 logger = logging.getLogger(__name__)
 
+# Line ending in a price such as "250.00" or "1,250.50" - a safe place to split OCR text
+_AMOUNT_LINE_END_RE = re.compile(r'\d[\d,]*\.\d{2}\s*$')
+
+# Model every Grok call uses; the extraction cache keys on it as well
+GROK_MODEL = "llama-3.1-8b-instant"
+
+# HTTP statuses worth retrying: throttling, timeouts and server-side failures;
+# any other 4xx means the request itself is wrong and will fail again
+_RETRYABLE_STATUSES = frozenset((408, 429, 500, 502, 503, 504))
+
+# Reused to pull the first JSON object out of a reply wrapped in prose
+_JSON_DECODER = json.JSONDecoder()
+
 
 class LineItem:
     """Represents a single line item from a bill"""
@@ -67,11 +89,25 @@ class GrokAPIClient:
         """
         self.api_key = api_key
         self.base_url = "https://api.groq.com/openai/v1"
-        self.model = "llama-3.1-8b-instant"
+        self.model = GROK_MODEL
         self.max_retries = 3
         self.initial_retry_delay = 2
+        self.max_retry_delay = 30
         
-        logger.info(f"✅ Grok API client initialized with model: {self.model}")
+        # Shared by all request threads so connections to the API are reused;
+        # the headers never change, so they are set once on the session
+        self.session = create_session(Config.HTTP_POOL_SIZE)
+        self.session.headers.update({
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        })
+        
+        # Paces calls to the provider's per-minute quota; the client is shared,
+        # so this covers every page, chunk and retry in the process
+        rpm = Config.LLM_REQUESTS_PER_MINUTE
+        self.rate_limiter = TokenBucket(capacity=rpm, refill_rate=rpm / 60) if rpm > 0 else None
+        
+        logger.info("✅ Grok API client initialized with model: %s", self.model)
     
     def call(self, messages: List[Dict[str, str]], 
              max_tokens: int = 4000) -> Tuple[str, int, int]:
@@ -81,71 +117,106 @@ class GrokAPIClient:
         Args:
             messages: List of message dictionaries (role, content)
             max_tokens: Maximum tokens in response
-            
+        
         Returns:
             Tuple of (response_text, input_tokens, output_tokens)
-            
+        
         Raises:
             Exception: If all retries fail
         """
+        # Encoded once with orjson and reused by every retry
+        body = orjson.dumps({
+            "model": self.model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": 0.1
+        })
+        
         for attempt in range(self.max_retries + 1):
+            if self.rate_limiter is not None and not self.rate_limiter.acquire(timeout=Config.REQUEST_TIMEOUT):
+                raise Exception(f"Grok API rate limit: no request slot within {Config.REQUEST_TIMEOUT}s")
+            
             try:
-                logger.debug(f"🔄 Grok API call attempt {attempt + 1}/{self.max_retries + 1}")
+                logger.debug("🔄 Grok API call attempt %s/%s", attempt + 1, self.max_retries + 1)
                 
-                response = requests.post(
+                response = self.session.post(
                     f"{self.base_url}/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": self.model,
-                        "messages": messages,
-                        "max_tokens": max_tokens,
-                        "temperature": 0.1
-                    },
+                    data=body,
                     timeout=60
                 )
                 
                 response.raise_for_status()
-                result = response.json()
+                result = orjson.loads(response.content)
                 
                 # Extract response and tokens
                 response_text = result['choices'][0]['message']['content']
                 input_tokens = result.get('usage', {}).get('prompt_tokens', 0)
                 output_tokens = result.get('usage', {}).get('completion_tokens', 0)
                 
-                logger.info(f"✅ Grok API call successful. Tokens: {input_tokens + output_tokens}")
+                logger.debug("✅ Grok API call successful. Tokens: %s", input_tokens + output_tokens)
                 return response_text, input_tokens, output_tokens
-                
+            
             except requests.exceptions.HTTPError as e:
-                error_msg = str(e.response.text if hasattr(e, 'response') else e)
-                logger.error(f"❌ HTTP Error (attempt {attempt + 1}): {error_msg}")
+                error_msg = str(e.response.text if e.response is not None else e)
+                logger.error("❌ HTTP Error (attempt %s): %s", attempt + 1, error_msg)
+                
+                status = e.response.status_code if e.response is not None else None
+                if status is not None and status not in _RETRYABLE_STATUSES:
+                    raise Exception(f"Grok API rejected the request (HTTP {status}): {error_msg}")
                 
                 if attempt < self.max_retries:
-                    delay = self.initial_retry_delay * (2 ** attempt)
-                    logger.info(f"🔄 Retrying in {delay}s...")
+                    delay = self._retry_delay(attempt, e.response)
+                    logger.info("🔄 Retrying in %.1fs...", delay)
                     time.sleep(delay)
                 else:
                     raise Exception(f"Grok API failed after {self.max_retries + 1} attempts: {error_msg}")
-                    
+            
             except requests.exceptions.Timeout:
-                logger.error(f"❌ Request timeout (attempt {attempt + 1})")
+                logger.error("❌ Request timeout (attempt %s)", attempt + 1)
                 if attempt < self.max_retries:
-                    delay = self.initial_retry_delay * (2 ** attempt)
-                    logger.info(f"🔄 Retrying in {delay}s...")
+                    delay = self._retry_delay(attempt)
+                    logger.info("🔄 Retrying in %.1fs...", delay)
                     time.sleep(delay)
                 else:
                     raise Exception("Grok API timeout after all retries")
-                    
+            
             except Exception as e:
-                logger.error(f"❌ Error (attempt {attempt + 1}): {e}")
+                logger.error("❌ Error (attempt %s): %s", attempt + 1, e)
                 if attempt < self.max_retries:
-                    delay = self.initial_retry_delay * (2 ** attempt)
-                    logger.info(f"🔄 Retrying in {delay}s...")
+                    delay = self._retry_delay(attempt)
+                    logger.info("🔄 Retrying in %.1fs...", delay)
                     time.sleep(delay)
                 else:
                     raise
+    
+    def close(self) -> None:
+        """Close the pooled connections to the API"""
+        self.session.close()
+    
+    def _retry_delay(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        """
+        Seconds to wait before the next attempt
+        
+        Honors a numeric Retry-After header from the API; otherwise backs off
+        exponentially with random jitter so concurrent callers throttled at
+        the same moment do not all retry in lockstep.
+        
+        Args:
+            attempt: Zero-based number of the attempt that just failed
+            response: Failed HTTP response, if there was one
+        
+        Returns:
+            Delay in seconds, capped at max_retry_delay
+        """
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after:
+            try:
+                return min(max(float(retry_after), 0.0), self.max_retry_delay)
+            except ValueError:
+                pass  # HTTP-date form; fall back to backoff
+        
+        backoff = min(self.initial_retry_delay * (2 ** attempt), self.max_retry_delay)
+        return random.uniform(backoff / 2, backoff)
 
 
 class LLMProcessor:
@@ -154,25 +225,53 @@ class LLMProcessor:
     Handles multi-page bills, deduplication, and total reconciliation
     """
     
+    # Shared across instances so a repeated document skips the LLM call
+    extraction_cache = ExtractionCache(
+        maxsize=Config.EXTRACTION_CACHE_SIZE,
+        redis_client=create_redis_client(Config.REDIS_URL),
+        redis_ttl=Config.EXTRACTION_CACHE_TTL,
+        redis_retry_after=Config.REDIS_RETRY_AFTER,
+        model=GROK_MODEL
+    )
+    
+    # Shared across instances; processors are per-document, the client is per-process
+    _shared_api_client: Optional[GrokAPIClient] = None
+    _shared_api_client_lock = threading.Lock()
+    
     def __init__(self):
-        """Initialize LLM processor with Grok API client"""
+        """Initialize LLM processor with the shared Grok API client"""
         try:
-            self.api_client = GrokAPIClient(Config.GROK_API_KEY)
+            self.api_client = self.get_api_client()
             
-            # Token tracking
+            # Token tracking (pages of one document may be requested concurrently)
             self.total_input_tokens = 0
             self.total_output_tokens = 0
             self.total_tokens = 0
+            self._token_lock = threading.Lock()
             
             # Item tracking for deduplication
             self.seen_items: Dict[Tuple, LineItem] = {}
             self.all_items: List[LineItem] = []
             
-            logger.info("✅ LLM Processor initialized successfully")
+            logger.debug("✅ LLM Processor initialized successfully")
         except Exception as e:
-            logger.error(f"❌ Failed to initialize LLM Processor: {e}")
+            logger.error("❌ Failed to initialize LLM Processor: %s", e)
             raise
     
+    @classmethod
+    def get_api_client(cls) -> GrokAPIClient:
+        """
+        Get the process-wide Grok API client, creating it on first use
+        
+        Returns:
+            Shared GrokAPIClient instance
+        """
+        if cls._shared_api_client is None:
+            with cls._shared_api_client_lock:
+                if cls._shared_api_client is None:
+                    cls._shared_api_client = GrokAPIClient(Config.GROK_API_KEY)
+        return cls._shared_api_client
+    
     def reset_token_usage(self) -> None:
         """Reset token usage counters"""
         self.total_input_tokens = 0
@@ -180,6 +279,19 @@ class LLMProcessor:
         self.total_tokens = 0
         logger.debug("🔄 Token usage counters reset")
     
+    def _record_token_usage(self, input_tok: int, output_tok: int) -> None:
+        """
+        Add one LLM call's tokens to the cumulative counters
+        
+        Args:
+            input_tok: Prompt tokens used
+            output_tok: Completion tokens used
+        """
+        with self._token_lock:
+            self.total_input_tokens += input_tok
+            self.total_output_tokens += output_tok
+            self.total_tokens += (input_tok + output_tok)
+    
     def reset_items(self) -> None:
         """Reset item tracking for new extraction"""
         self.seen_items.clear()
@@ -202,7 +314,8 @@ class LLMProcessor:
     def extract_bill_items(
         self,
         ocr_text: str,
-        page_number: str = "1"
+        page_number: str = "1",
+        use_cache: bool = True
     ) -> Tuple[Dict[str, Any], int, int]:
         """
         Extract bill line items from OCR text using Grok
@@ -210,66 +323,553 @@ class LLMProcessor:
         Args:
             ocr_text: Clean OCR-extracted text from bill
             page_number: Current page number
-            
+            use_cache: Serve from the extraction cache when possible
+        
         Returns:
             Tuple of (extracted_data_dict, input_tokens, output_tokens)
         """
-        logger.info(f"🤖 Starting extraction for page {page_number}")
+        logger.debug("🤖 Starting extraction for page %s", page_number)
+        
+        cached = self._get_cached_extraction(ocr_text, page_number) if use_cache else None
+        if cached is not None:
+            return cached, 0, 0
         
         try:
-            # Identify page type
-            page_type = self._identify_page_type(ocr_text)
-            logger.info(f"📄 Page type identified: {page_type}")
-            
-            # Create extraction prompt
-            prompt = ExtractionPrompts.get_extraction_prompt(ocr_text, page_number)
-            
-            # Call Grok API
-            messages = [{"role": "user", "content": prompt}]
-            response_text, input_tok, output_tok = self.api_client.call(messages)
-            
-            # Update token counters
-            self.total_input_tokens += input_tok
-            self.total_output_tokens += output_tok
-            self.total_tokens += (input_tok + output_tok)
+            responses = self._request_page(ocr_text, page_number)
+            return self._assemble_page_result(ocr_text, page_number, responses)
+        except Exception as e:
+            return self._extraction_error(page_number, e)
+    
+    def _request_page(self, ocr_text: str, page_number: str) -> List[Tuple[Dict[str, Any], int, int]]:
+        """
+        Send the LLM requests for one page without touching processor state
+        
+        Args:
+            ocr_text: OCR text of the page
+            page_number: Page number
+        
+        Returns:
+            List of (parsed_json_dict, input_tokens, output_tokens), one per chunk
+        """
+        # Long pages are split so each LLM call stays within MAX_OCR_CHARS
+        chunks = self._split_ocr_text(ocr_text, Config.MAX_OCR_CHARS, Config.OCR_CHUNK_OVERLAP)
+        
+        if len(chunks) == 1:
+            return [self._request_extraction(ocr_text, page_number)]
+        
+        logger.info("✂️  Page %s split into %s chunks", page_number, len(chunks))
+        with ThreadPoolExecutor(
+            max_workers=min(len(chunks), Config.LLM_CHUNK_CONCURRENCY),
+            thread_name_prefix="llm-chunk"
+        ) as executor:
+            return list(executor.map(
+                lambda chunk: self._request_extraction(chunk, page_number),
+                chunks
+            ))
+    
+    def _assemble_page_result(
+        self,
+        ocr_text: str,
+        page_number: str,
+        responses: List[Tuple[Dict[str, Any], int, int]]
+    ) -> Tuple[Dict[str, Any], int, int]:
+        """
+        Merge a page's LLM responses, validate its items and cache the result
+        
+        Args:
+            ocr_text: OCR text of the page
+            page_number: Page number
+            responses: Output of _request_page
+        
+        Returns:
+            Tuple of (extracted_data_dict, input_tokens, output_tokens)
+        """
+        # Identify page type
+        page_type = self._identify_page_type(ocr_text)
+        logger.debug("📄 Page type identified: %s", page_type)
+        
+        input_tok = sum(tokens for _, tokens, _ in responses)
+        output_tok = sum(tokens for _, _, tokens in responses)
+        
+        # Update token counters
+        self._record_token_usage(input_tok, output_tok)
+        
+        logger.debug("📊 Token usage: input=%s, output=%s", input_tok, output_tok)
+        
+        parsed_chunks = [data for data, _, _ in responses if data]
+        
+        if not parsed_chunks:
+            logger.warning("⚠️  Failed to parse JSON response")
+            return {
+                "page_type": page_type,
+                "line_items": [],
+                "subtotal": None
+            }, input_tok, output_tok
+        
+        # Items repeated in the overlap between chunks are removed as duplicates
+        extracted_data = {
+            "line_items": [
+                item
+                for data in parsed_chunks
+                for item in data.get("line_items", [])
+            ],
+            # Totals are printed at the end of a page, so the last chunk wins
+            "subtotal": next(
+                (data["subtotal"] for data in reversed(parsed_chunks) if data.get("subtotal") is not None),
+                None
+            ),
+            "page_total": next(
+                (data["page_total"] for data in reversed(parsed_chunks) if data.get("page_total") is not None),
+                None
+            )
+        }
+        
+        # Extract and validate line items
+        line_items, validation_report = self._process_line_items(
+            extracted_data.get("line_items", []),
+            page_number
+        )
+        
+        logger.debug("✅ Extracted %s valid items from page %s", len(line_items), page_number)
+        
+        result = {
+            "page_type": page_type,
+            "line_items": [item.to_dict() for item in line_items],
+            "subtotal": extracted_data.get("subtotal"),
+            "page_total": extracted_data.get("page_total"),
+            "validation": validation_report
+        }
+        
+        if line_items:
+            self.extraction_cache.put(ocr_text, page_number, result)
+        
+        return result, input_tok, output_tok
+    
+    @staticmethod
+    def _extraction_error(page_number: str, error: Exception) -> Tuple[Dict[str, Any], int, int]:
+        """
+        Build the empty result returned when a page could not be extracted
+        
+        Args:
+            page_number: Page number
+            error: Exception raised during extraction
+        
+        Returns:
+            Tuple of (error_result_dict, 0, 0)
+        """
+        logger.error(
+            "❌ Extraction error on page %s: %s", page_number, error,
+            exc_info=logger.isEnabledFor(logging.DEBUG)
+        )
+        return {
+            "page_type": "Bill Detail",
+            "line_items": [],
+            "error": str(error)
+        }, 0, 0
+    
+    def extract_bill_items_combined(
+        self,
+        ocr_texts: List[str],
+        use_cache: bool = True
+    ) -> List[Tuple[Dict[str, Any], int, int]]:
+        """
+        Extract line items for several unrelated single-page documents in one Grok call
+        
+        Documents are independent, so item tracking is reset per document.
+        Token usage of the shared call is split in proportion to OCR text length.
+        Documents missing from the combined response fall back to a single call.
+        
+        Args:
+            ocr_texts: OCR text of each document
+            use_cache: Serve from the extraction cache when possible
+        
+        Returns:
+            List of (extracted_data_dict, input_tokens, output_tokens) in input order
+        """
+        results: List[Any] = [None] * len(ocr_texts)
+        pending = []
+        
+        for idx, ocr_text in enumerate(ocr_texts):
+            self.reset_items()
+            cached = self._get_cached_extraction(ocr_text, "1") if use_cache else None
+            if cached is not None:
+                results[idx] = (cached, 0, 0)
+            elif len(ocr_text) <= Config.MAX_OCR_CHARS:
+                pending.append(idx)
+            # Longer documents are chunked by extract_bill_items in the fallback below
+        
+        if len(pending) > 1:
+            logger.info("🤖 Starting combined extraction for %s documents", len(pending))
+            try:
+                messages = ExtractionPrompts.get_batch_extraction_messages(
+                    [(str(idx), ocr_texts[idx]) for idx in pending]
+                )
+                response_text, input_tok, output_tok = self.api_client.call(
+                    messages,
+                    max_tokens=min(Config.MAX_TOKENS * len(pending), Config.MAX_BATCH_TOKENS)
+                )
+                
+                self._record_token_usage(input_tok, output_tok)
+                
+                parsed = self._parse_json_response(response_text)
+                documents = {
+                    str(doc.get("id")): doc
+                    for doc in parsed.get("documents", [])
+                    if isinstance(doc, dict)
+                }
+                total_chars = sum(len(ocr_texts[idx]) for idx in pending) or 1
+                
+                for idx in pending:
+                    doc = documents.get(str(idx))
+                    if doc is None:
+                        logger.warning("⚠️  Document %s missing from combined response", idx)
+                        continue
+                    
+                    self.reset_items()
+                    result = self._build_page_result(doc, ocr_texts[idx], "1")
+                    
+                    share = len(ocr_texts[idx]) / total_chars
+                    results[idx] = (result, round(input_tok * share), round(output_tok * share))
             
-            logger.debug(f"📊 Token usage: input={input_tok}, output={output_tok}")
+            except Exception as e:
+                logger.error("❌ Combined extraction failed: %s", e)
+        
+        for idx, result in enumerate(results):
+            if result is None:
+                self.reset_items()
+                results[idx] = self.extract_bill_items(ocr_texts[idx], "1", use_cache=False)
+        
+        return results
+    
+    def extract_document_pages(
+        self,
+        ocr_pages: List[str],
+        use_cache: bool = True
+    ) -> Tuple[List[Tuple[str, Dict[str, Any]]], int, int]:
+        """
+        Extract line items for every page of one document
+        
+        Consecutive uncached pages share one Grok call, up to LLM_PAGES_PER_CALL
+        pages and MAX_OCR_CHARS characters, so the instructions are sent once
+        per group instead of once per page. Long pages and pages missing from
+        a combined response are extracted on their own. Up to LLM_CONCURRENCY
+        groups are requested at once; items are processed in page order, so
+        duplicates across pages are still dropped.
+        
+        Args:
+            ocr_pages: OCR text of each page in document order
+            use_cache: Serve from the extraction cache when possible
+        
+        Returns:
+            Tuple of ([(page_number, extracted_data_dict)], input_tokens, output_tokens)
+            covering the non-empty pages
+        """
+        pages = [(str(page_no), text) for page_no, text in enumerate(ocr_pages, 1) if text.strip()]
+        cached = {
+            page_no: self.extraction_cache.get(text, page_no)
+            for page_no, text in pages
+        } if use_cache else {}
+        
+        groups = self._group_pages(pages, cached)
+        page_results = []
+        input_tok = output_tok = 0
+        
+        # Send every group's LLM request up front so their latencies overlap,
+        # then process the replies in page order so cross-page duplicate
+        # tracking sees items in the same order as a sequential run
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(len(groups), Config.LLM_CONCURRENCY)),
+            thread_name_prefix="llm-page"
+        ) as executor:
+            requests_in_flight = {}
+            for idx, group in enumerate(groups):
+                if len(group) > 1:
+                    requests_in_flight[idx] = executor.submit(self._request_page_group, group)
+                elif cached.get(group[0][0]) is None:
+                    requests_in_flight[idx] = executor.submit(self._request_page, group[0][1], group[0][0])
             
-            # Parse JSON response
-            extracted_data = self._parse_json_response(response_text)
+            for idx, group in enumerate(groups):
+                combined = {}
+                if len(group) > 1:
+                    combined, group_input_tok, group_output_tok = requests_in_flight[idx].result()
+                    input_tok += group_input_tok
+                    output_tok += group_output_tok
+                
+                for page_no, text in group:
+                    if cached.get(page_no) is not None:
+                        data = self._reuse_cached_extraction(cached[page_no], page_no)
+                        page_results.append((page_no, data))
+                        continue
+                    
+                    if page_no in combined:
+                        data = self._build_page_result(combined[page_no], text, page_no)
+                    elif len(group) > 1:
+                        logger.warning("⚠️  Page %s missing from combined response", page_no)
+                        data, page_input_tok, page_output_tok = self.extract_bill_items(text, page_no, use_cache=False)
+                        input_tok += page_input_tok
+                        output_tok += page_output_tok
+                    else:
+                        try:
+                            data, page_input_tok, page_output_tok = self._assemble_page_result(
+                                text, page_no, requests_in_flight[idx].result()
+                            )
+                        except Exception as e:
+                            data, page_input_tok, page_output_tok = self._extraction_error(page_no, e)
+                        input_tok += page_input_tok
+                        output_tok += page_output_tok
+                    page_results.append((page_no, data))
+        
+        return page_results, input_tok, output_tok
+    
+    @staticmethod
+    def _group_pages(
+        pages: List[Tuple[str, str]],
+        cached: Dict[str, Optional[Dict[str, Any]]]
+    ) -> List[List[Tuple[str, str]]]:
+        """
+        Group consecutive pages that can share one extraction call
+        
+        Args:
+            pages: List of (page_number, ocr_text) tuples in page order
+            cached: Cached extraction per page number (None on miss)
+        
+        Returns:
+            List of page groups in page order; cached and long pages stand alone
+        """
+        groups: List[List[Tuple[str, str]]] = []
+        current: List[Tuple[str, str]] = []
+        current_chars = 0
+        
+        for page_no, text in pages:
+            if cached.get(page_no) is not None or len(text) > Config.MAX_OCR_CHARS:
+                if current:
+                    groups.append(current)
+                    current, current_chars = [], 0
+                groups.append([(page_no, text)])
+                continue
             
-            if not extracted_data:
-                logger.warning("⚠️  Failed to parse JSON response")
-                return {
-                    "page_type": page_type,
-                    "line_items": [],
-                    "subtotal": None
-                }, input_tok, output_tok
+            if current and (
+                len(current) >= Config.LLM_PAGES_PER_CALL
+                or current_chars + len(text) > Config.MAX_OCR_CHARS
+            ):
+                groups.append(current)
+                current, current_chars = [], 0
             
-            # Extract and validate line items
-            line_items = self._process_line_items(
-                extracted_data.get("line_items", []),
-                page_number
+            current.append((page_no, text))
+            current_chars += len(text)
+        
+        if current:
+            groups.append(current)
+        return groups
+    
+    def _request_page_group(
+        self,
+        group: List[Tuple[str, str]]
+    ) -> Tuple[Dict[str, Dict[str, Any]], int, int]:
+        """
+        Extract several pages of one document in a single Grok call
+        
+        Args:
+            group: List of (page_number, ocr_text) tuples
+        
+        Returns:
+            Tuple of (raw page data keyed by page number, input_tokens, output_tokens);
+            the mapping is empty if the call fails
+        """
+        logger.info("🤖 Extracting pages %s-%s in one call", group[0][0], group[-1][0])
+        try:
+            messages = ExtractionPrompts.get_multipage_extraction_messages(group)
+            response_text, input_tok, output_tok = self.api_client.call(
+                messages,
+                max_tokens=min(Config.MAX_TOKENS * len(group), Config.MAX_BATCH_TOKENS)
             )
+        except Exception as e:
+            logger.error("❌ Combined page extraction failed: %s", e)
+            return {}, 0, 0
+        
+        self._record_token_usage(input_tok, output_tok)
+        
+        parsed = self._parse_json_response(response_text)
+        pages = parsed.get("pages", []) if isinstance(parsed, dict) else []
+        expected = {page_no for page_no, _ in group}
+        combined = {
+            str(page.get("page_no")): page
+            for page in pages
+            if isinstance(page, dict) and str(page.get("page_no")) in expected
+        }
+        return combined, input_tok, output_tok
+    
+    def _build_page_result(
+        self,
+        raw_page: Dict[str, Any],
+        ocr_text: str,
+        page_number: str
+    ) -> Dict[str, Any]:
+        """
+        Validate the items of one page from a combined response and cache the result
+        
+        Args:
+            raw_page: Page entry parsed from the LLM response
+            ocr_text: OCR text of the page
+            page_number: Page number
+        
+        Returns:
+            Extraction result in the same shape as extract_bill_items
+        """
+        line_items, validation_report = self._process_line_items(raw_page.get("line_items", []), page_number)
+        result = {
+            "page_type": self._identify_page_type(ocr_text),
+            "line_items": [item.to_dict() for item in line_items],
+            "subtotal": raw_page.get("subtotal"),
+            "page_total": raw_page.get("page_total"),
+            "validation": validation_report
+        }
+        
+        if line_items:
+            self.extraction_cache.put(ocr_text, page_number, result)
+        
+        return result
+    
+    def _request_extraction(self, ocr_text: str, page_number: str) -> Tuple[Dict[str, Any], int, int]:
+        """
+        Run one extraction prompt through Grok and parse the reply
+        
+        Safe to call from worker threads: processor state is not touched.
+        
+        Args:
+            ocr_text: OCR text (a whole page or one chunk of it)
+            page_number: Page number the text belongs to
+        
+        Returns:
+            Tuple of (parsed_json_dict, input_tokens, output_tokens)
+        """
+        messages = ExtractionPrompts.get_extraction_messages(ocr_text, page_number)
+        response_text, input_tok, output_tok = self.api_client.call(messages)
+        parsed = self._parse_json_response(response_text)
+        
+        # Send an unusable reply back with what was wrong rather than
+        # losing the page's items
+        for _ in range(Config.LLM_FORMAT_RETRIES):
+            problem = self._reply_format_problem(parsed)
+            if problem is None:
+                break
+            logger.warning("⚠️  Unusable reply for page %s (%s), asking again", page_number, problem)
+            messages = messages + ExtractionPrompts.get_format_feedback_messages(response_text, problem)
+            response_text, retry_input_tok, retry_output_tok = self.api_client.call(messages)
+            input_tok += retry_input_tok
+            output_tok += retry_output_tok
+            parsed = self._parse_json_response(response_text)
+        
+        return parsed, input_tok, output_tok
+    
+    @staticmethod
+    def _reply_format_problem(parsed: Any) -> Optional[str]:
+        """
+        Check a parsed extraction reply has the requested shape
+        
+        Args:
+            parsed: Output of _parse_json_response
+        
+        Returns:
+            Description of the problem, or None if the reply is usable
+        """
+        if not parsed:
+            return "it was empty or not valid JSON"
+        if not isinstance(parsed, dict):
+            return "it was not a JSON object"
+        if not isinstance(parsed.get("line_items"), list):
+            return '"line_items" must be a list'
+        return None
+    
+    @staticmethod
+    def _split_ocr_text(ocr_text: str, max_chars: int, overlap: int = 200) -> List[str]:
+        """
+        Split long OCR text into chunks on line boundaries
+        
+        Prefers cutting after a line ending in an amount so a line item is
+        not separated from its price. Consecutive chunks share up to
+        `overlap` characters of whole lines.
+        
+        Args:
+            ocr_text: OCR text of one page
+            max_chars: Maximum characters per chunk
+            overlap: Characters of trailing lines repeated in the next chunk
+        
+        Returns:
+            List of chunks (the original text if it already fits)
+        """
+        if max_chars <= 0 or len(ocr_text) <= max_chars:
+            return [ocr_text]
+        
+        lines = []
+        for line in ocr_text.splitlines(keepends=True):
+            # A single oversized line is hard-split
+            lines.extend(line[i:i + max_chars] for i in range(0, len(line), max_chars))
+        
+        chunks = []
+        start = 0
+        
+        while start < len(lines):
+            size = 0
+            end = start
+            cut = None
             
-            logger.info(f"✅ Extracted {len(line_items)} valid items from page {page_number}")
+            while end < len(lines) and size + len(lines[end]) <= max_chars:
+                size += len(lines[end])
+                end += 1
+                if _AMOUNT_LINE_END_RE.search(lines[end - 1]):
+                    cut = end
             
-            return {
-                "page_type": page_type,
-                "line_items": [item.to_dict() for item in line_items],
-                "subtotal": extracted_data.get("subtotal"),
-                "page_total": extracted_data.get("page_total")
-            }, input_tok, output_tok
+            if end == len(lines) or cut is None or cut <= start:
+                cut = end
             
-        except Exception as e:
-            logger.error(f"❌ Extraction error on page {page_number}: {e}")
-            import traceback
-            logger.debug(traceback.format_exc())
-            return {
-                "page_type": "Bill Detail",
-                "line_items": [],
-                "error": str(e)
-            }, 0, 0
+            chunks.append("".join(lines[start:cut]))
+            if cut >= len(lines):
+                break
+            
+            # Step back over whole lines to build the overlap, always moving forward
+            next_start = cut
+            carried = 0
+            while next_start - 1 > start and carried + len(lines[next_start - 1]) <= overlap:
+                next_start -= 1
+                carried += len(lines[next_start])
+            start = next_start
+        
+        return chunks
+    
+    def _get_cached_extraction(self, ocr_text: str, page_number: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a previous extraction of the same OCR text
+        
+        Args:
+            ocr_text: OCR text to look up
+            page_number: Page number for logging and the cache key
+        
+        Returns:
+            Extraction result, or None on cache miss
+        """
+        cached = self.extraction_cache.get(ocr_text, page_number)
+        if cached is None:
+            return None
+        return self._reuse_cached_extraction(cached, page_number)
+    
+    def _reuse_cached_extraction(self, cached: Dict[str, Any], page_number: str) -> Dict[str, Any]:
+        """
+        Prepare a cached extraction for use in the current document
+        
+        Args:
+            cached: Copy of the cached extraction result
+            page_number: Page number the result is used for
+        
+        Returns:
+            Extraction result with items re-checked against this document
+        """
+        # Re-run item processing so cross-page duplicate tracking still sees these items
+        line_items, validation_report = self._process_line_items(cached.get("line_items", []), page_number)
+        cached["line_items"] = [item.to_dict() for item in line_items]
+        cached["validation"] = validation_report
+        logger.debug("🎯 Cache hit for page %s: %s items, no LLM call", page_number, len(line_items))
+        return cached
     
     def _identify_page_type(self, ocr_text: str) -> str:
         """
@@ -277,7 +877,7 @@ class LLMProcessor:
         
         Args:
             ocr_text: OCR text to analyze
-            
+        
         Returns:
             Page type: "Bill Detail", "Final Bill", or "Pharmacy"
         """
@@ -302,18 +902,21 @@ class LLMProcessor:
         self,
         items_data: List[Dict],
         page_number: str
-    ) -> List[LineItem]:
+    ) -> Tuple[List[LineItem], Dict[str, Any]]:
         """
-        Process and deduplicate line items
+        Process, validate and deduplicate line items in a single pass
         
         Args:
             items_data: Raw line item data from LLM
             page_number: Page number for logging
-            
+        
         Returns:
-            List of validated LineItem objects
+            Tuple of (validated LineItem objects, validation report)
         """
         processed_items = []
+        valid_count = 0
+        duplicate_count = 0
+        warnings = []
         
         for idx, item_data in enumerate(items_data):
             try:
@@ -329,31 +932,50 @@ class LLMProcessor:
                 # Validate
                 if not item.is_valid():
                     logger.warning(
-                        f"⚠️  Invalid item on page {page_number}, index {idx}: "
-                        f"name={item_name}, amount={item_amount}"
+                        "⚠️  Invalid item on page %s, index %s: "
+                        "name=%s, amount=%s",
+                        page_number, idx, item_name, item_amount
                     )
+                    warnings.append(f"Invalid item at index {idx}: {item_name}")
                     continue
                 
+                valid_count += 1
+                
+                # Guard against date/ID misinterpretation
+                if BillValidator._looks_like_date_or_id(item_name):
+                    logger.warning("⚠️  Item name looks like date/ID: %s", item_name)
+                
                 # Check for duplicates
                 hash_key = item.get_hash_key()
                 if hash_key in self.seen_items:
                     logger.info(
-                        f"🚫 Duplicate detected on page {page_number}: {item_name}"
+                        "🚫 Duplicate detected on page %s: %s", page_number, item_name
                     )
+                    duplicate_count += 1
                     continue
                 
                 # Add to tracking
                 self.seen_items[hash_key] = item
                 self.all_items.append(item)
                 processed_items.append(item)
-                
-            except (ValueError, TypeError) as e:
+            
+            except (ValueError, TypeError, AttributeError) as e:
                 logger.warning(
-                    f"⚠️  Failed to process item on page {page_number}, index {idx}: {e}"
+                    "⚠️  Failed to process item on page %s, index %s: %s", page_number, idx, e
                 )
+                warnings.append(f"Unparseable item at index {idx}: {e}")
                 continue
         
-        return processed_items
+        total_items = len(items_data)
+        validation_report = {
+            "total_items": total_items,
+            "valid_items": valid_count,
+            "duplicate_items": duplicate_count,
+            "quality_score": round(valid_count / total_items * 100, 2) if total_items else 0,
+            "warnings": warnings
+        }
+        
+        return processed_items, validation_report
     
     def _parse_json_response(self, response_text: str) -> Dict[str, Any]:
         """
@@ -361,10 +983,17 @@ class LLMProcessor:
         
         Args:
             response_text: Raw response from Grok
-            
+        
         Returns:
             Parsed JSON dictionary
         """
+        try:
+            # Fast path: the reply is usually bare JSON (orjson ignores
+            # surrounding whitespace), so skip the cleanup below
+            return orjson.loads(response_text)
+        except json.JSONDecodeError:
+            pass
+        
         try:
             # Remove markdown if present
             clean_text = response_text.strip()
@@ -379,16 +1008,25 @@ class LLMProcessor:
             
             clean_text = clean_text.strip()
             
-            parsed = json.loads(clean_text)
+            try:
+                parsed = orjson.loads(clean_text)
+            except json.JSONDecodeError:
+                # Model added text around the object: decode from the first
+                # brace in one forward pass and ignore whatever follows it
+                start = clean_text.find("{")
+                if start < 0:
+                    raise
+                parsed, _ = _JSON_DECODER.raw_decode(clean_text, start)
+            
             logger.debug("✅ JSON parsed successfully")
             return parsed
-            
+        
         except json.JSONDecodeError as e:
-            logger.error(f"❌ JSON parse error: {e}")
-            logger.debug(f"Response preview: {response_text[:300]}")
+            logger.error("❌ JSON parse error: %s", e)
+            logger.debug("Response preview: %.300s", response_text)
             return {}
         except Exception as e:
-            logger.error(f"❌ Parsing error: {e}")
+            logger.error("❌ Parsing error: %s", e)
             return {}
     
     def get_deduplication_report(self) -> Dict[str, Any]:
@@ -410,7 +1048,7 @@ class LLMProcessor:
         
         Args:
             claimed_total: Total claimed on bill
-            
+        
         Returns:
             Reconciliation report with variance analysis
         """
@@ -1,14 +1,19 @@
 """
-OCR Extractor - Extracts text from document images
+OCR Extractor - Extracts text from document images and PDFs
 Supports Tesseract OCR
 """
 
 import logging
+import threading
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
+from typing import List
 from PIL import Image
 import pytesseract
+from pdf2image import convert_from_bytes
 from config import Config
+from utils.http_session import create_session
 
 logger = logging.getLogger(__name__)
 
@@ -26,7 +31,11 @@ class OCRExtractor:
         if Config.TESSERACT_CMD:
             pytesseract.pytesseract.tesseract_cmd = Config.TESSERACT_CMD
         
-        logger.info(f"✅ OCR Extractor initialized with service: {self.ocr_service}")
+        # Created on first download so each worker process gets its own pool
+        self._session = None
+        self._session_lock = threading.Lock()
+        
+        logger.info("✅ OCR Extractor initialized with service: %s", self.ocr_service)
     
     def extract_text_from_url(self, image_url: str) -> str:
         """
@@ -36,37 +45,100 @@ class OCRExtractor:
             image_url: URL of the document image
             
         Returns:
-            Extracted text string
+            Extracted text string (pages separated by blank lines)
+        """
+        return '\n\n'.join(page for page in self.extract_pages_from_url(image_url) if page)
+    
+    def extract_pages_from_url(self, document_url: str) -> List[str]:
+        """
+        Extract text from every page of a document URL using OCR
+        
+        Images are a single page; PDFs are rasterized and their pages are
+        OCR'd concurrently.
+        
+        Args:
+            document_url: URL of the document image or PDF
+            
+        Returns:
+            List of extracted text strings, one per page
         """
-        logger.info(f"🔍 Starting OCR extraction from URL")
+        logger.debug("🔍 Starting OCR extraction from URL")
         
         try:
-            # Download image
-            logger.debug(f"📥 Downloading image from URL...")
-            response = requests.get(image_url, timeout=30)
+            # Download document
+            logger.debug("📥 Downloading document from URL...")
+            response = self._get_session().get(document_url, timeout=30)
             response.raise_for_status()
             
-            # Open image
-            image = Image.open(BytesIO(response.content))
-            logger.info(f"✅ Image loaded successfully. Size: {image.size}")
+            images = self._load_pages(response.content)
+            logger.debug("✅ Document loaded successfully. Pages: %s", len(images))
             
-            # Preprocess image
-            image = self._preprocess_image(image)
+            if len(images) == 1:
+                pages = [self._ocr_page(images[0])]
+            else:
+                # Tesseract runs as a subprocess, so pages OCR in parallel
+                workers = min(len(images), Config.OCR_CONCURRENCY)
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    pages = list(executor.map(self._ocr_page, images))
             
-            # Extract text using Tesseract
-            text = self._extract_with_tesseract(image)
-            
-            logger.info(f"✅ OCR extraction complete. Text length: {len(text)} chars")
-            return text
+            logger.debug(
+                "✅ OCR extraction complete. Text length: %s chars", sum(len(p) for p in pages)
+            )
+            return pages
             
         except requests.exceptions.RequestException as e:
-            logger.error(f"❌ Failed to download image: {e}")
+            logger.error("❌ Failed to download image: %s", e)
             raise Exception(f"Failed to download image from URL: {str(e)}")
         
         except Exception as e:
-            logger.error(f"❌ OCR extraction failed: {e}")
+            logger.error("❌ OCR extraction failed: %s", e)
             raise Exception(f"Failed to extract text from image: {str(e)}")
     
+    def _get_session(self) -> requests.Session:
+        """
+        Get the pooled download session, creating it on first use
+        
+        Returns:
+            Shared requests.Session
+        """
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = create_session(Config.HTTP_POOL_SIZE)
+        return self._session
+    
+    def _load_pages(self, content: bytes) -> List[Image.Image]:
+        """
+        Load page images from downloaded document bytes
+        
+        Args:
+            content: Raw document bytes
+            
+        Returns:
+            List of PIL Images, one per page
+        """
+        if content[:5] == b'%PDF-':
+            return convert_from_bytes(
+                content,
+                dpi=Config.PDF_DPI,
+                last_page=Config.MAX_PDF_PAGES
+            )
+        
+        return [Image.open(BytesIO(content))]
+    
+    def _ocr_page(self, image: Image.Image) -> str:
+        """
+        Preprocess and OCR a single page image
+        
+        Args:
+            image: PIL Image object
+            
+        Returns:
+            Extracted text
+        """
+        image = self._preprocess_image(image)
+        return self._extract_with_tesseract(image)
+    
     def _preprocess_image(self, image: Image.Image) -> Image.Image:
         """
         Preprocess image for better OCR accuracy
@@ -89,7 +161,7 @@ class OCRExtractor:
             ratio = max_size / max(image.size)
             new_size = tuple(int(dim * ratio) for dim in image.size)
             image = image.resize(new_size, Image.Resampling.LANCZOS)
-            logger.debug(f"📏 Resized image to {new_size}")
+            logger.debug("📏 Resized image to %s", new_size)
         
         return image
     
@@ -129,7 +201,7 @@ class OCRExtractor:
             )
         
         except Exception as e:
-            logger.error(f"❌ Tesseract extraction failed: {e}")
+            logger.error("❌ Tesseract extraction failed: %s", e)
             raise Exception(f"Tesseract OCR failed: {str(e)}")
     
     def _clean_text(self, text: str) -> str:
@@ -0,0 +1,92 @@
+"""
+Rate Limiter - Token bucket guarding upstream OCR/LLM quotas
+Sheds excess load with 429 instead of letting provider errors surface as 500s
+"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter
+    """
+    
+    def __init__(self, capacity: float, refill_rate: float):
+        """
+        Initialize token bucket
+        
+        Args:
+            capacity: Maximum burst size (tokens)
+            refill_rate: Tokens added per second
+        """
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _refill(self) -> None:
+        """Add tokens earned since the last update (caller holds the lock)"""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.refill_rate)
+        self._updated_at = now
+    
+    def try_acquire(self, tokens: float = 1) -> bool:
+        """
+        Take tokens if available without waiting
+        
+        Args:
+            tokens: Number of tokens to take
+        
+        Returns:
+            True if the tokens were taken
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+    
+    def acquire(self, tokens: float = 1, timeout: float = 0) -> bool:
+        """
+        Take tokens, waiting up to timeout seconds for them to refill
+        
+        Args:
+            tokens: Number of tokens to take
+            timeout: Maximum seconds to wait
+        
+        Returns:
+            True if the tokens were taken before the timeout
+        """
+        deadline = time.monotonic() + timeout
+        
+        while True:
+            if self.try_acquire(tokens):
+                return True
+            
+            wait = min(self.retry_after(tokens), deadline - time.monotonic())
+            if wait <= 0:
+                return False
+            time.sleep(wait)
+    
+    def retry_after(self, tokens: float = 1) -> float:
+        """
+        Seconds until the requested tokens are available
+        
+        Args:
+            tokens: Number of tokens needed
+        
+        Returns:
+            Seconds to wait (0 if available now)
+        """
+        with self._lock:
+            self._refill()
+            missing = tokens - self._tokens
+        
+        if missing <= 0:
+            return 0.0
+        if self.refill_rate <= 0:
+            return float('inf')
+        return missing / self.refill_rate
\ No newline at end of file
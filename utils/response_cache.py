@@ -0,0 +1,104 @@
+"""
+Response Cache - Serves repeated document URLs without reprocessing
+Time-limited LRU of final API responses keyed by document URL
+"""
+
+import copy
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache of success responses with per-entry expiry
+    """
+    
+    def __init__(self, maxsize: int = 10000, ttl: float = 3600):
+        """
+        Initialize response cache
+        
+        Args:
+            maxsize: Maximum number of cached responses (0 disables)
+            ttl: Seconds a cached response stays valid
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, document_url: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response
+        
+        Args:
+            document_url: Document URL from the request
+        
+        Returns:
+            Copy of the cached response with zeroed token usage, or None
+        """
+        if self.maxsize <= 0:
+            return None
+        
+        with self._lock:
+            entry = self._entries.get(document_url)
+            if entry is None:
+                return None
+            
+            expires_at, response = entry
+            if expires_at <= time.monotonic():
+                del self._entries[document_url]
+                return None
+            
+            self._entries.move_to_end(document_url)
+        
+        return ResponseCache.as_cached(response)
+    
+    @staticmethod
+    def as_cached(response: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Copy a response for serving to a request that did not produce it
+        
+        Args:
+            response: Formatted success response
+        
+        Returns:
+            Copy of the response with zeroed token usage
+        """
+        cached = copy.deepcopy(response)
+        # No LLM tokens are spent serving a cached response
+        cached["token_usage"] = {
+            "total_tokens": 0,
+            "input_tokens": 0,
+            "output_tokens": 0
+        }
+        return cached
+    
+    def put(self, document_url: str, response: Dict[str, Any]) -> None:
+        """
+        Store a success response
+        
+        Args:
+            document_url: Document URL from the request
+            response: Formatted success response
+        """
+        if self.maxsize <= 0:
+            return
+        
+        entry = (time.monotonic() + self.ttl, copy.deepcopy(response))
+        
+        with self._lock:
+            self._entries[document_url] = entry
+            self._entries.move_to_end(document_url)
+            
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Remove all cached responses"""
+        with self._lock:
+            self._entries.clear()
@@ -4,10 +4,32 @@ Ensures compliance with required schema
 """
 
 import logging
-from typing import Dict, List, Any
+import math
+from typing import Dict, List, Any, Optional
+
+from utils.schemas import BillItem, PageItems, SuccessResponse, ErrorResponse
 
 logger = logging.getLogger(__name__)
 
+# Allowed page types keyed by their casefolded form for one-lookup validation
+_PAGE_TYPES = {
+    page_type.casefold(): page_type
+    for page_type in ("Bill Detail", "Final Bill", "Pharmacy")
+}
+_DEFAULT_PAGE_TYPE = "Bill Detail"
+# Canonical spellings, accepted as-is without normalizing
+_CANONICAL_PAGE_TYPES = frozenset(_PAGE_TYPES.values())
+
+# Required keys per level of a success response, checked with one subset test each
+_SUCCESS_KEYS = frozenset(("token_usage", "data"))
+_TOKEN_KEYS = frozenset(("total_tokens", "input_tokens", "output_tokens"))
+_DATA_KEYS = frozenset(("pagewise_line_items", "total_item_count"))
+_PAGE_KEYS = frozenset(("page_no", "page_type", "bill_items"))
+_ITEM_KEYS = frozenset(("item_name", "item_amount", "item_rate", "item_quantity"))
+
+# Currency symbols, thousands separators and spaces removed in one translate pass
+_NUMBER_STRIP_TABLE = str.maketrans('', '', '₹$€£,\u00a0 ')
+
 
 class ResponseFormatter:
     """
@@ -16,10 +38,10 @@ class ResponseFormatter:
     
     @staticmethod
     def success_response(
-        pagewise_items: List[Dict],
+        pagewise_items: List[PageItems],
         token_usage: Dict[str, int],
         total_item_count: int
-    ) -> Dict[str, Any]:
+    ) -> SuccessResponse:
         """
         Format successful extraction response
         
@@ -44,11 +66,11 @@ class ResponseFormatter:
             }
         }
         
-        logger.debug(f"✅ Success response formatted with {total_item_count} items")
+        logger.debug("✅ Success response formatted with %s items", total_item_count)
         return response
     
     @staticmethod
-    def error_response(message: str) -> Dict[str, Any]:
+    def error_response(message: str) -> ErrorResponse:
         """
         Format error response
         
@@ -63,7 +85,7 @@ class ResponseFormatter:
             "message": message
         }
         
-        logger.debug(f"❌ Error response formatted: {message}")
+        logger.debug("❌ Error response formatted: %s", message)
         return response
     
     @staticmethod
@@ -71,7 +93,7 @@ class ResponseFormatter:
         page_number: str,
         page_type: str,
         line_items: List[Dict]
-    ) -> Dict[str, Any]:
+    ) -> PageItems:
         """
         Format items for a single page
         
@@ -84,15 +106,14 @@ class ResponseFormatter:
             Formatted page dictionary
         """
         # Format each line item
-        formatted_items = []
+        formatted_items: List[BillItem] = []
         
+        clean_line_item = ResponseFormatter._clean_line_item
         for item in line_items:
-            formatted_item = {
-                "item_name": str(item.get("item_name", "")),
-                "item_amount": float(item.get("item_amount", 0.0)),
-                "item_rate": float(item.get("item_rate", 0.0)),
-                "item_quantity": float(item.get("item_quantity", 0.0))
-            }
+            formatted_item = clean_line_item(item)
+            if formatted_item is None:
+                logger.warning("⚠️  Dropping malformed item on page %s: %s", page_number, item)
+                continue
             formatted_items.append(formatted_item)
         
         page_data = {
@@ -101,7 +122,7 @@ class ResponseFormatter:
             "bill_items": formatted_items
         }
         
-        logger.debug(f"✅ Formatted page {page_number} with {len(formatted_items)} items")
+        logger.debug("✅ Formatted page %s with %s items", page_number, len(formatted_items))
         return page_data
     
     @staticmethod
@@ -109,6 +130,9 @@ class ResponseFormatter:
         """
         Validate response matches required schema
         
+        Responses built by success_response/error_response always match;
+        this is for checking responses from other sources (tests, clients).
+        
         Args:
             response: Response dictionary
             
@@ -123,35 +147,31 @@ class ResponseFormatter:
             
             if response["is_success"]:
                 # Success response validation
-                required_keys = ["token_usage", "data"]
-                if not all(key in response for key in required_keys):
-                    logger.warning(f"⚠️  Missing required keys in success response")
+                if not _SUCCESS_KEYS.issubset(response):
+                    logger.warning("⚠️  Missing required keys in success response")
                     return False
                 
                 # Validate token_usage
-                token_keys = ["total_tokens", "input_tokens", "output_tokens"]
-                if not all(key in response["token_usage"] for key in token_keys):
+                if not _TOKEN_KEYS.issubset(response["token_usage"]):
                     logger.warning("⚠️  Missing token usage keys")
                     return False
                 
                 # Validate data structure
                 data = response["data"]
-                if "pagewise_line_items" not in data or "total_item_count" not in data:
+                if not _DATA_KEYS.issubset(data):
                     logger.warning("⚠️  Missing data keys")
                     return False
                 
                 # Validate pagewise_line_items
                 for page in data["pagewise_line_items"]:
-                    page_keys = ["page_no", "page_type", "bill_items"]
-                    if not all(key in page for key in page_keys):
-                        logger.warning(f"⚠️  Missing page keys: {page}")
+                    if not _PAGE_KEYS.issubset(page):
+                        logger.warning("⚠️  Missing page keys: %s", page)
                         return False
                     
                     # Validate bill_items
                     for item in page["bill_items"]:
-                        item_keys = ["item_name", "item_amount", "item_rate", "item_quantity"]
-                        if not all(key in item for key in item_keys):
-                            logger.warning(f"⚠️  Missing item keys: {item}")
+                        if not _ITEM_KEYS.issubset(item):
+                            logger.warning("⚠️  Missing item keys: %s", item)
                             return False
             
             else:
@@ -164,7 +184,7 @@ class ResponseFormatter:
             return True
             
         except Exception as e:
-            logger.error(f"❌ Schema validation error: {e}")
+            logger.error("❌ Schema validation error: %s", e)
             return False
     
     @staticmethod
@@ -179,4 +199,69 @@ class ResponseFormatter:
             Total amount as float
         """
         total = sum(float(item.get("item_amount", 0.0)) for item in line_items)
-        return round(total, 2)
\ No newline at end of file
+        return round(total, 2)
+    
+    @staticmethod
+    def _clean_line_item(item: Dict[str, Any]) -> Optional[BillItem]:
+        """
+        Normalize a line item: strip the name and convert amounts to float
+        
+        Args:
+            item: Line item dictionary (amounts may be numeric strings)
+        
+        Returns:
+            Cleaned line item, or None if the name is empty or an amount is invalid
+        """
+        to_float = ResponseFormatter._to_float
+        name = str(item.get("item_name", "")).strip()
+        amount = to_float(item.get("item_amount", 0.0))
+        rate = to_float(item.get("item_rate", 0.0))
+        quantity = to_float(item.get("item_quantity", 0.0))
+        
+        if not name or amount is None or rate is None or quantity is None:
+            return None
+        
+        return {
+            "item_name": name,
+            "item_amount": amount,
+            "item_rate": rate,
+            "item_quantity": quantity
+        }
+    
+    @staticmethod
+    def _to_float(value: Any) -> Optional[float]:
+        """
+        Convert a number or numeric string (e.g. "₹1,000.50") to float
+        
+        Args:
+            value: Value to convert
+        
+        Returns:
+            Float value, or None if not a finite number
+        """
+        if isinstance(value, str):
+            value = value.translate(_NUMBER_STRIP_TABLE)
+        
+        try:
+            number = float(value)
+        except (ValueError, TypeError):
+            return None
+        
+        return number if math.isfinite(number) else None
+    
+    @staticmethod
+    def _validate_page_type(page_type: Any) -> str:
+        """
+        Normalize a page type to one of the allowed values (case-insensitive)
+        
+        Args:
+            page_type: Page type to check
+        
+        Returns:
+            Canonical page type, or "Bill Detail" if not recognized
+        """
+        if not isinstance(page_type, str):
+            return _DEFAULT_PAGE_TYPE
+        if page_type in _CANONICAL_PAGE_TYPES:
+            return page_type
+        return _PAGE_TYPES.get(page_type.strip().casefold(), _DEFAULT_PAGE_TYPE)
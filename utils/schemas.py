@@ -0,0 +1,47 @@
+"""
+Response Schemas - Typed shapes of the API response
+Built only by ResponseFormatter, so every response has all required keys
+"""
+
+from typing import List, TypedDict
+
+
+class BillItem(TypedDict):
+    """Single extracted line item"""
+    item_name: str
+    item_amount: float
+    item_rate: float
+    item_quantity: float
+
+
+class PageItems(TypedDict):
+    """Line items extracted from one page"""
+    page_no: str
+    page_type: str
+    bill_items: List[BillItem]
+
+
+class TokenUsage(TypedDict):
+    """LLM token usage for a request"""
+    total_tokens: int
+    input_tokens: int
+    output_tokens: int
+
+
+class ResponseData(TypedDict):
+    """Payload of a success response"""
+    pagewise_line_items: List[PageItems]
+    total_item_count: int
+
+
+class SuccessResponse(TypedDict):
+    """Successful extraction response"""
+    is_success: bool
+    token_usage: TokenUsage
+    data: ResponseData
+
+
+class ErrorResponse(TypedDict):
+    """Failed request response"""
+    is_success: bool
+    message: str
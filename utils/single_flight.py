@@ -0,0 +1,67 @@
+"""
+Single Flight - Collapses concurrent identical work into one call
+Callers asking for a key that is already in progress wait for that result
+"""
+
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+    """
+    Thread-safe in-flight call deduplication keyed by an arbitrary hashable
+    """
+    
+    def __init__(self):
+        """Initialize with no calls in flight"""
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+    
+    def run(self, key: Hashable, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Tuple[Any, bool]:
+        """
+        Run fn for key, or wait for the call already running for key
+        
+        Args:
+            key: Identity of the work (e.g. document URL)
+            fn: Function doing the work
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+        
+        Returns:
+            Tuple of (result, is_leader) where is_leader is False for callers
+            that shared another caller's result
+        
+        Raises:
+            Exception: Whatever fn raised, for the leader and every waiter
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._calls[key] = future
+        
+        if not is_leader:
+            return future.result(), False
+        
+        try:
+            result = fn(*args, **kwargs)
+            future.set_result(result)
+            return result, True
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+    
+    def in_flight(self) -> int:
+        """
+        Get number of keys currently being worked on
+        
+        Returns:
+            Count of in-flight calls
+        """
+        with self._lock:
+            return len(self._calls)
@@ -5,11 +5,67 @@ Guards against common extraction errors
 
 import logging
 import re
-from typing import Dict, List, Tuple
-from urllib.parse import urlparse
+from functools import lru_cache
+from math import isclose, isfinite
+from typing import Any, Dict, List, Tuple
+from urllib.parse import urlsplit
 
 logger = logging.getLogger(__name__)
 
+# Longer URLs are rejected before reaching the validation cache
+MAX_URL_LENGTH = 2000
+
+# Fields every line item must carry; the frozenset gives a single C-level
+# subset test, the tuple keeps the order used to name a missing field
+_REQUIRED_ITEM_FIELDS = ("item_name", "item_amount", "item_rate", "item_quantity")
+_REQUIRED_ITEM_KEYS = frozenset(_REQUIRED_ITEM_FIELDS)
+_NUMERIC_ITEM_FIELDS = ("item_amount", "item_rate", "item_quantity")
+
+_URL_RE = re.compile(r'^https?://[^\s/$.?#][^\s]*$', re.I)
+_HTTP_SCHEME_RE = re.compile(r'^https?://', re.I)
+
+# Values that are bill metadata rather than products (dates, invoice/reference
+# IDs, times), fused into one anchored pattern so each value is matched once
+_METADATA_RE = re.compile(
+    r'^(?:\d{4}-\d{2}-\d{2}'
+    r'|\d{1,2}/\d{1,2}/\d{2,4}'
+    r'|(?:INV|REF)-?\d+'
+    r'|\d{1,2}:\d{2}(?::\d{2})?)$',
+    re.IGNORECASE
+)
+
+# Total reconciliation tolerances: totals within a cent are a match; beyond
+# that, the variance as a percentage of the claimed total must stay under 1%
+# to be acceptable and under 5% to need only review
+_MATCH_ABS_TOL = 0.01
+_ACCEPTABLE_VARIANCE_PCT = 1.0
+_REVIEW_VARIANCE_PCT = 5.0
+
+
+@lru_cache(maxsize=4096)
+def _check_url(url: str) -> Tuple[bool, str]:
+    """
+    Validate URL format (cached, since the same URLs are submitted repeatedly)
+    
+    Args:
+        url: Non-empty URL string no longer than MAX_URL_LENGTH
+    
+    Returns:
+        Tuple of (is_valid, error_message)
+    """
+    if not _URL_RE.match(url):
+        if not _HTTP_SCHEME_RE.match(url):
+            return False, "URL must use HTTP or HTTPS protocol"
+        return False, "Invalid URL format"
+    
+    try:
+        if not urlsplit(url).hostname:
+            return False, "Invalid URL format"
+    except ValueError as e:
+        return False, f"Invalid URL: {str(e)}"
+    
+    return True, ""
+
 
 class BillValidator:
     """
@@ -33,19 +89,27 @@ class BillValidator:
         if not isinstance(url, str):
             return False, "Document URL must be a string"
         
-        # Basic URL validation
+        if len(url) > MAX_URL_LENGTH:
+            return False, f"URL is too long (max {MAX_URL_LENGTH} characters)"
+        
+        return _check_url(url)
+    
+    @staticmethod
+    def validate_amount(amount: Any) -> bool:
+        """
+        Validate a monetary amount
+        
+        Args:
+            amount: Number or numeric string
+        
+        Returns:
+            True if amount is a finite, non-negative number
+        """
         try:
-            result = urlparse(url)
-            if not all([result.scheme, result.netloc]):
-                return False, "Invalid URL format"
-            
-            if result.scheme not in ['http', 'https']:
-                return False, "URL must use HTTP or HTTPS protocol"
-            
-            return True, ""
-            
-        except Exception as e:
-            return False, f"Invalid URL: {str(e)}"
+            value = float(amount)
+        except (ValueError, TypeError):
+            return False
+        return isfinite(value) and value >= 0
     
     @staticmethod
     def validate_line_item(item: Dict) -> Tuple[bool, str]:
@@ -58,20 +122,17 @@ class BillValidator:
         Returns:
             Tuple of (is_valid, error_message)
         """
-        required_fields = ["item_name", "item_amount", "item_rate", "item_quantity"]
-        
         # Check required fields
-        for field in required_fields:
-            if field not in item:
-                return False, f"Missing required field: {field}"
+        if not _REQUIRED_ITEM_KEYS <= item.keys():
+            missing = next(field for field in _REQUIRED_ITEM_FIELDS if field not in item)
+            return False, f"Missing required field: {missing}"
         
         # Validate item_name
         if not item["item_name"] or not isinstance(item["item_name"], str):
             return False, "item_name must be a non-empty string"
         
         # Validate numeric fields
-        numeric_fields = ["item_amount", "item_rate", "item_quantity"]
-        for field in numeric_fields:
+        for field in _NUMERIC_ITEM_FIELDS:
             try:
                 value = float(item[field])
                 if value < 0:
@@ -79,12 +140,31 @@ class BillValidator:
             except (ValueError, TypeError):
                 return False, f"{field} must be a valid number"
         
+        # Reject dates, times and invoice/reference IDs read as products
+        if BillValidator._is_metadata_value(item["item_name"].strip()):
+            return False, f"item_name looks like metadata, not a product: {item['item_name']}"
+        
         # Guard against date/ID misinterpretation
         if BillValidator._looks_like_date_or_id(item["item_name"]):
-            logger.warning(f"⚠️  Item name looks like date/ID: {item['item_name']}")
+            logger.warning("⚠️  Item name looks like date/ID: %s", item['item_name'])
         
         return True, ""
     
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _is_metadata_value(value: str) -> bool:
+        """
+        Check if a value is a date, time or invoice/reference ID
+        (cached, since names repeat across pages and documents)
+        
+        Args:
+            value: Stripped text to check
+        
+        Returns:
+            True if value is bill metadata
+        """
+        return _METADATA_RE.match(value) is not None
+    
     @staticmethod
     def _looks_like_date_or_id(text: str) -> bool:
         """
@@ -125,11 +205,12 @@ class BillValidator:
         duplicates = []
         
         for item in line_items:
-            # Create a key from name, amount, and quantity
+            # Key on name, amount and quantity: casefold matches case variants
+            # beyond ASCII, rounding to cents ignores float noise
             key = (
-                item.get("item_name", "").lower().strip(),
-                float(item.get("item_amount", 0)),
-                float(item.get("item_quantity", 0))
+                item.get("item_name", "").strip().casefold(),
+                round(float(item.get("item_amount", 0)), 2),
+                round(float(item.get("item_quantity", 0)), 2)
             )
             
             if key in seen:
@@ -153,6 +234,17 @@ class BillValidator:
         Returns:
             Dictionary with quality metrics
         """
+        # Nothing to score: skip the validation loop entirely
+        if not line_items:
+            logger.info("📊 Quality Score: %.2f%% (no line items)", 0)
+            return {
+                "total_items": 0,
+                "valid_items": 0,
+                "invalid_items": 0,
+                "quality_score": 0,
+                "warnings": ["No line items extracted"]
+            }
+        
         total_items = len(line_items)
         valid_items = 0
         warnings = []
@@ -164,21 +256,18 @@ class BillValidator:
             else:
                 warnings.append(f"Invalid item: {error}")
         
-        # Check for suspicious patterns
-        if total_items == 0:
-            warnings.append("No line items extracted")
-        
         # Calculate quality score
-        quality_score = (valid_items / total_items * 100) if total_items > 0 else 0
+        quality_score = valid_items / total_items * 100
         
         report = {
             "total_items": total_items,
             "valid_items": valid_items,
+            "invalid_items": total_items - valid_items,
             "quality_score": round(quality_score, 2),
             "warnings": warnings
         }
         
-        logger.info(f"📊 Quality Score: {quality_score:.2f}% ({valid_items}/{total_items} valid)")
+        logger.info("📊 Quality Score: %.2f%% (%s/%s valid)", quality_score, valid_items, total_items)
         
         return report
     
@@ -204,12 +293,15 @@ class BillValidator:
         variance = abs(extracted_total - claimed_total)
         variance_percentage = (variance / claimed_total * 100) if claimed_total > 0 else 0
         
-        # Determine status
-        if variance == 0:
+        # Determine status; a mismatch against a non-positive claim has no
+        # meaningful percentage, so it is never treated as acceptable
+        if isclose(extracted_total, claimed_total, rel_tol=0, abs_tol=_MATCH_ABS_TOL):
             status = "perfect_match"
-        elif variance_percentage < 1:
+        elif claimed_total <= 0:
+            status = "significant_discrepancy"
+        elif variance_percentage < _ACCEPTABLE_VARIANCE_PCT:
             status = "acceptable"
-        elif variance_percentage < 5:
+        elif variance_percentage < _REVIEW_VARIANCE_PCT:
             status = "needs_review"
         else:
             status = "significant_discrepancy"
@@ -222,7 +314,8 @@ class BillValidator:
             "status": status
         }
         
-        logger.info(f"💰 Total Reconciliation: {status} "
-                   f"(Extracted: {extracted_total:.2f}, Claimed: {claimed_total:.2f})")
+        logger.info("💰 Total Reconciliation: %s "
+                   "(Extracted: %.2f, Claimed: %.2f)",
+                   status, extracted_total, claimed_total)
         
         return reconciliation
\ No newline at end of file